@@ -1,13 +1,17 @@
 # main.py
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from pydantic import BaseModel
 import uvicorn
 import os
 import sys
+import msgspec
 import numpy as np
+import orjson
 import random
 import traceback
 import openai
@@ -17,21 +21,23 @@ from dotenv import load_dotenv
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 try:
-    from backend.simulation import SimpleForagingModel
+    from backend.simulation import SimpleForagingModel, close_io_client, shutdown_llm_executor
     from backend.schemas import (
-        SimulationConfig, SimulationResult, StepState, AntState, 
-        PheromoneMapData, ForagingEfficiencyData, FoodDepletionPoint,
+        SimulationConfig, SimulationResult,
         ComparisonConfig, ComparisonResult, PerformanceData,
-        PheromoneConfigUpdate, PredatorState
+        PheromoneConfigUpdate,
+        AntStateStruct, PredatorStateStruct, StepStateStruct,
+        PheromoneMapStruct, ForagingEfficiencyStruct
     )
 except ImportError:
     # Fallback for local development
-    from simulation import SimpleForagingModel
+    from simulation import SimpleForagingModel, close_io_client, shutdown_llm_executor
     from schemas import (
-        SimulationConfig, SimulationResult, StepState, AntState, 
-        PheromoneMapData, ForagingEfficiencyData, FoodDepletionPoint,
+        SimulationConfig, SimulationResult,
         ComparisonConfig, ComparisonResult, PerformanceData,
-        PheromoneConfigUpdate, PredatorState
+        PheromoneConfigUpdate,
+        AntStateStruct, PredatorStateStruct, StepStateStruct,
+        PheromoneMapStruct, ForagingEfficiencyStruct
     )
 
 # Load environment variables
@@ -53,10 +59,18 @@ except Exception as e:
     print(f"⚠️ Blockchain client could not be loaded: {e}. Blockchain features will use simulated transactions.")
     BLOCKCHAIN_ENABLED = False
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Release the LLM worker pool and pooled connections shared by all simulation runs
+    shutdown_llm_executor()
+    close_io_client()
+
 app = FastAPI(
     title="Antelligence API",
     description="AI-Powered Ant Colony Simulation with Blockchain Integration",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Mount static files (frontend build)
@@ -104,13 +118,42 @@ app.add_middleware(
     allow_headers=["*"],  # Allow all headers to prevent CORS preflight issues
 )
 
-def convert_pheromone_maps(model) -> PheromoneMapData:
+def _msgspec_enc_hook(obj):
+    """Encode types msgspec doesn't natively support (numpy values, Pydantic models)."""
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    raise NotImplementedError(f"Objects of type {type(obj)} are not supported")
+
+json_encoder = msgspec.json.Encoder(enc_hook=_msgspec_enc_hook)
+msgpack_encoder = msgspec.msgpack.Encoder(enc_hook=_msgspec_enc_hook)
+
+def grid_to_json(grid: np.ndarray) -> msgspec.Raw:
+    """Pre-encode a 2D grid as a JSON nested list, transposed for correct orientation.
+
+    orjson serializes the array buffer directly, skipping ndarray.tolist();
+    msgspec embeds the resulting bytes as-is when encoding the response.
+    """
+    return msgspec.Raw(orjson.dumps(np.ascontiguousarray(grid.T), option=orjson.OPT_SERIALIZE_NUMPY))
+
+def grid_to_packed(grid: np.ndarray) -> dict:
+    """Pack a 2D grid as raw little-endian float32 bytes plus its (rows, cols) shape.
+
+    Transposed like grid_to_json; decode with new Float32Array(data) on the client.
+    """
+    arr = np.ascontiguousarray(grid.T, dtype='<f4')
+    return {"shape": arr.shape, "data": arr.tobytes()}
+
+def convert_pheromone_maps(model, encode_grid=grid_to_json) -> PheromoneMapStruct:
     """Convert numpy pheromone maps to JSON-serializable format."""
-    return PheromoneMapData(
-        trail=model.pheromone_map['trail'].T.tolist(),  # Transpose for correct orientation
-        alarm=model.pheromone_map['alarm'].T.tolist(),
-        recruitment=model.pheromone_map['recruitment'].T.tolist(),
-        fear=model.pheromone_map.get('fear', np.zeros_like(model.pheromone_map['trail'])).T.tolist(),
+    return PheromoneMapStruct(
+        trail=encode_grid(model.pheromone_map['trail']),
+        alarm=encode_grid(model.pheromone_map['alarm']),
+        recruitment=encode_grid(model.pheromone_map['recruitment']),
+        fear=encode_grid(model.pheromone_map.get('fear', np.zeros_like(model.pheromone_map['trail']))),
         max_values={
             'trail': float(np.max(model.pheromone_map['trail'])),
             'alarm': float(np.max(model.pheromone_map['alarm'])),
@@ -119,7 +162,7 @@ def convert_pheromone_maps(model) -> PheromoneMapData:
         }
     )
 
-def convert_efficiency_data(model) -> ForagingEfficiencyData:
+def convert_efficiency_data(model, encode_grid=grid_to_json) -> ForagingEfficiencyStruct:
     """Convert foraging efficiency grid to JSON-serializable format."""
     max_eff = float(np.max(model.foraging_efficiency_grid))
     
@@ -130,8 +173,8 @@ def convert_efficiency_data(model) -> ForagingEfficiencyData:
         hotspot_coords = np.argwhere(model.foraging_efficiency_grid >= threshold)
         hotspots = [(int(x), int(y)) for x, y in hotspot_coords[:20]]  # Limit to 20 hotspots
     
-    return ForagingEfficiencyData(
-        efficiency_grid=model.foraging_efficiency_grid.T.tolist(),  # Transpose for correct orientation
+    return ForagingEfficiencyStruct(
+        efficiency_grid=encode_grid(model.foraging_efficiency_grid),
         max_efficiency=max_eff,
         hotspot_locations=hotspots
     )
@@ -154,12 +197,15 @@ async def test_simulation():
         )
         
         steps_run = 0
-        for i in range(10):  # Run only 10 steps
-            if not model.foods:
-                break
-            model.step()
-            steps_run += 1
-            print(f"[TEST] Step {i+1}: {len(model.foods)} food remaining")
+        try:
+            for i in range(10):  # Run only 10 steps
+                if not model.foods:
+                    break
+                model.step()
+                steps_run += 1
+                print(f"[TEST] Step {i+1}: {len(model.foods)} food remaining")
+        finally:
+            model.flush_blockchain()
         
         print(f"[TEST] Completed {steps_run} steps")
         
@@ -180,6 +226,174 @@ async def test_simulation():
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"Test failed: {str(e)}")
 
+def _build_model(config: SimulationConfig) -> SimpleForagingModel:
+    """Seeds the RNGs and builds a model configured from a SimulationConfig."""
+    print(f"[SIMULATION] Starting simulation with config: {config.dict()}")
+    print(f"[BLOCKCHAIN] Backend blockchain enabled: {BLOCKCHAIN_ENABLED}")
+    np.random.seed(42)
+    random.seed(42)
+
+    model = SimpleForagingModel(
+        width=config.grid_width,
+        height=config.grid_height,
+        N_ants=config.n_ants,
+        N_food=config.n_food,
+        agent_type=config.agent_type,
+        with_queen=config.use_queen,
+        use_llm_queen=config.use_llm_queen,
+        selected_model_param=config.selected_model,
+        prompt_style_param=config.prompt_style,
+        N_predators=config.n_predators if config.enable_predators else 0,
+        predator_type=config.predator_type
+    )
+    
+    # Apply pheromone configuration
+    model.set_pheromone_params(
+        config.pheromone_decay_rate,
+        config.trail_deposit,
+        config.alarm_deposit, 
+        config.recruitment_deposit,
+        config.max_pheromone_value,
+        config.fear_deposit
+    )
+    
+    print(f"[SIMULATION] Model initialized. API enabled: {model.api_enabled}")
+    return model
+
+def _iter_steps(model: SimpleForagingModel, config: SimulationConfig, encode_grid=grid_to_json):
+    """Advances the model step by step, yielding a StepStateStruct after each step."""
+    # Determine how often to capture detailed state (every N steps for performance)
+    detail_interval = max(1, config.max_steps // 50)  # Capture ~50 detailed snapshots
+    
+    for step_num in range(config.max_steps):
+        if not model.foods:
+            print(f"[SIMULATION] All food collected at step {step_num}")
+            break
+        
+        print(f"[SIMULATION] Running step {step_num + 1}/{config.max_steps}")
+        model.step()
+
+        # --- Create the list of agents for the current step ---
+        ants_list = [
+            AntStateStruct(
+                id=ant.unique_id, 
+                pos=ant.pos, 
+                carrying_food=ant.carrying_food, 
+                is_llm=ant.is_llm_controlled,
+                steps_since_food=ant.steps_since_food
+            ) 
+            for ant in model.ants
+        ]
+
+        # If the queen exists, add her to the list with a special flag
+        if model.queen:
+            center_pos = (model.width // 2, model.height // 2)
+            queen_state = AntStateStruct(
+                id='queen', 
+                pos=center_pos, 
+                carrying_food=False, 
+                is_llm=model.use_llm_queen, 
+                is_queen=True
+            )
+            ants_list.append(queen_state)
+        
+        # --- Create the list of predators for the current step ---
+        predators_list = [
+            PredatorStateStruct(
+                id=predator.unique_id,
+                pos=predator.pos,
+                energy=predator.energy,
+                is_llm=predator.is_llm_controlled,
+                ants_caught=predator.ants_caught,
+                hunt_cooldown=predator.hunt_cooldown
+            )
+            for predator in model.predators
+        ]
+        
+        # Capture detailed state periodically or for final step
+        capture_detail = (step_num % detail_interval == 0) or (step_num == config.max_steps - 1)
+        pheromone_data = None
+        efficiency_data = None
+        
+        if capture_detail:
+            pheromone_data = convert_pheromone_maps(model, encode_grid)
+            efficiency_data = convert_efficiency_data(model, encode_grid)
+        
+        # --- Capture the full state for this step ---
+        current_state = StepStateStruct(
+            step=model.step_count,
+            ants=ants_list,
+            predators=predators_list,
+            food_positions=model.get_food_positions(),
+            metrics=model.metrics.copy(),
+            queen_report=model.queen_llm_anomaly_rep,
+            errors=model.errors.copy(),
+            pheromone_data=pheromone_data,
+            efficiency_data=efficiency_data,
+            nest_position=(model.width // 2, model.height // 2)
+        )
+        model.errors.clear()
+        yield current_state
+
+    print(f"[SIMULATION] Completed {model.step_count} steps")
+
+def _summarize(model: SimpleForagingModel, config: SimulationConfig, history: list,
+               encode_grid=grid_to_json) -> dict:
+    """Builds a payload matching the SimulationResult schema from a finished model."""
+
+    # Food depletion history is already a list of FoodDepletionPoint records
+    food_depletion_data = model.food_depletion_history
+
+    # Final state data
+    final_pheromone_data = convert_pheromone_maps(model, encode_grid)
+    final_efficiency_data = convert_efficiency_data(model, encode_grid)
+
+    # Collect blockchain logs and transactions (always enabled), once queued records land
+    model.flush_blockchain()
+    blockchain_logs = []
+    blockchain_transactions = []
+    if hasattr(model, 'blockchain_logs'):
+        blockchain_logs = model.blockchain_logs
+        print(f"[BLOCKCHAIN] Collected {len(blockchain_logs)} blockchain logs")
+    else:
+        print(f"[BLOCKCHAIN] No blockchain logs attribute found on model")
+    
+    if hasattr(model, 'blockchain_transactions'):
+        blockchain_transactions = model.blockchain_transactions
+        print(f"[BLOCKCHAIN] Collected {len(blockchain_transactions)} blockchain transactions")
+    else:
+        print(f"[BLOCKCHAIN] No blockchain transactions attribute found on model")
+
+    return {
+        "config": config,
+        "total_steps_run": model.step_count,
+        "final_metrics": model.metrics,
+        "history": history,
+        "food_depletion_history": food_depletion_data,
+        "initial_food_count": model.initial_food_count,
+        "final_pheromone_data": final_pheromone_data,
+        "final_efficiency_data": final_efficiency_data,
+        "blockchain_logs": blockchain_logs,
+        "blockchain_transactions": blockchain_transactions
+    }
+
+def _simulate(config: SimulationConfig, encode_grid=grid_to_json) -> dict:
+    """Runs a full simulation and returns a payload matching the SimulationResult schema."""
+    model = _build_model(config)
+    try:
+        history = list(_iter_steps(model, config, encode_grid))
+        return _summarize(model, config, history, encode_grid)
+    finally:
+        # Stops the blockchain worker threads even if the run failed
+        model.flush_blockchain()
+
+def _run_steps(model: SimpleForagingModel, max_steps: int) -> None:
+    """Steps the model until the food runs out or max_steps is reached."""
+    for _ in range(max_steps):
+        if not model.foods:
+            break
+        model.step()
+
 @app.post("/simulation/run", response_model=SimulationResult)
 async def run_simulation(config: SimulationConfig):
     """
@@ -187,159 +401,71 @@ async def run_simulation(config: SimulationConfig):
     Returns the history of every step and the final results.
     """
     try:
-        print(f"[SIMULATION] Starting simulation with config: {config.dict()}")
-        print(f"[BLOCKCHAIN] Backend blockchain enabled: {BLOCKCHAIN_ENABLED}")
-        np.random.seed(42)
-        random.seed(42)
-
-        model = SimpleForagingModel(
-            width=config.grid_width,
-            height=config.grid_height,
-            N_ants=config.n_ants,
-            N_food=config.n_food,
-            agent_type=config.agent_type,
-            with_queen=config.use_queen,
-            use_llm_queen=config.use_llm_queen,
-            selected_model_param=config.selected_model,
-            prompt_style_param=config.prompt_style,
-            N_predators=config.n_predators if config.enable_predators else 0,
-            predator_type=config.predator_type
-        )
-        
-        # Apply pheromone configuration
-        model.set_pheromone_params(
-            config.pheromone_decay_rate,
-            config.trail_deposit,
-            config.alarm_deposit, 
-            config.recruitment_deposit,
-            config.max_pheromone_value,
-            config.fear_deposit
-        )
-        
-        print(f"[SIMULATION] Model initialized. API enabled: {model.api_enabled}")
-        
-        history = []
-        # Determine how often to capture detailed state (every N steps for performance)
-        detail_interval = max(1, config.max_steps // 50)  # Capture ~50 detailed snapshots
-        
-        for step_num in range(config.max_steps):
-            if not model.foods:
-                print(f"[SIMULATION] All food collected at step {step_num}")
-                break
-            
-            print(f"[SIMULATION] Running step {step_num + 1}/{config.max_steps}")
-            model.step()
-
-            # --- Create the list of agents for the current step ---
-            ants_list = [
-                AntState(
-                    id=ant.unique_id, 
-                    pos=ant.pos, 
-                    carrying_food=ant.carrying_food, 
-                    is_llm=ant.is_llm_controlled,
-                    steps_since_food=ant.steps_since_food
-                ) 
-                for ant in model.ants
-            ]
-
-            # If the queen exists, add her to the list with a special flag
-            if model.queen:
-                center_pos = (model.width // 2, model.height // 2)
-                queen_state = AntState(
-                    id='queen', 
-                    pos=center_pos, 
-                    carrying_food=False, 
-                    is_llm=model.use_llm_queen, 
-                    is_queen=True
-                )
-                ants_list.append(queen_state)
-            
-            # --- Create the list of predators for the current step ---
-            predators_list = [
-                PredatorState(
-                    id=predator.unique_id,
-                    pos=predator.pos,
-                    energy=predator.energy,
-                    is_llm=predator.is_llm_controlled,
-                    ants_caught=predator.ants_caught,
-                    hunt_cooldown=predator.hunt_cooldown
-                )
-                for predator in model.predators
-            ]
-            
-            # Capture detailed state periodically or for final step
-            capture_detail = (step_num % detail_interval == 0) or (step_num == config.max_steps - 1)
-            pheromone_data = None
-            efficiency_data = None
-            
-            if capture_detail:
-                pheromone_data = convert_pheromone_maps(model)
-                efficiency_data = convert_efficiency_data(model)
-            
-            # --- Capture the full state for this step ---
-            current_state = StepState(
-                step=model.step_count,
-                ants=ants_list,
-                predators=predators_list,
-                food_positions=model.get_food_positions(),
-                metrics=model.metrics.copy(),
-                queen_report=model.queen_llm_anomaly_rep,
-                errors=model.errors.copy(),
-                pheromone_data=pheromone_data,
-                efficiency_data=efficiency_data,
-                nest_position=(model.width // 2, model.height // 2)
-            )
-            history.append(current_state)
-            model.errors.clear()
+        # The run blocks on CPU work and LLM calls, so keep it off the event loop.
+        # Encode directly with msgspec; the payload matches the SimulationResult schema
+        result = await run_in_threadpool(_simulate, config)
+        return Response(content=json_encoder.encode(result), media_type="application/json")
 
-        print(f"[SIMULATION] Completed {model.step_count} steps")
+    except Exception as e:
+        print("--- ERROR CAUGHT IN /simulation/run ---")
+        traceback.print_exc()
+        print("------------------------------------")
+        raise HTTPException(status_code=500, detail=str(e))
 
-        # Convert food depletion history to proper format
-        food_depletion_data = [
-            FoodDepletionPoint(step=point["step"], food_piles_remaining=point["food_piles_remaining"])
-            for point in model.food_depletion_history
-        ]
+@app.post("/simulation/run/msgpack")
+async def run_simulation_msgpack(config: SimulationConfig):
+    """
+    Same as /simulation/run, but MessagePack-encoded, with every pheromone and
+    efficiency grid sent as {"shape": [rows, cols], "data": <float32 LE bytes>}
+    instead of nested float lists.
+    """
+    try:
+        result = await run_in_threadpool(_simulate, config, encode_grid=grid_to_packed)
+        return Response(content=msgpack_encoder.encode(result), media_type="application/msgpack")
 
-        # Final state data
-        final_pheromone_data = convert_pheromone_maps(model)
-        final_efficiency_data = convert_efficiency_data(model)
-
-        # Collect blockchain logs and transactions (always enabled)
-        blockchain_logs = []
-        blockchain_transactions = []
-        if hasattr(model, 'blockchain_logs'):
-            blockchain_logs = model.blockchain_logs
-            print(f"[BLOCKCHAIN] Collected {len(blockchain_logs)} blockchain logs")
-        else:
-            print(f"[BLOCKCHAIN] No blockchain logs attribute found on model")
-        
-        if hasattr(model, 'blockchain_transactions'):
-            blockchain_transactions = model.blockchain_transactions
-            print(f"[BLOCKCHAIN] Collected {len(blockchain_transactions)} blockchain transactions")
-        else:
-            print(f"[BLOCKCHAIN] No blockchain transactions attribute found on model")
-
-        return SimulationResult(
-            config=config,
-            total_steps_run=model.step_count,
-            final_metrics=model.metrics,
-            history=history,
-            food_depletion_history=food_depletion_data,
-            initial_food_count=model.initial_food_count,
-            final_pheromone_data=final_pheromone_data,
-            final_efficiency_data=final_efficiency_data,
-            blockchain_logs=blockchain_logs,
-            blockchain_transactions=blockchain_transactions
-        )
+    except Exception as e:
+        print("--- ERROR CAUGHT IN /simulation/run/msgpack ---")
+        traceback.print_exc()
+        print("------------------------------------")
+        raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/simulation/stream")
+async def stream_simulation(config: SimulationConfig):
+    """
+    Runs a simulation and streams it as NDJSON while it runs. Each line is one
+    frame: {"type": "step", "state": <StepState>} per step, then a final
+    {"type": "result", "result": <SimulationResult with empty history>}.
+    If the run fails midway, the last line is {"type": "error", "detail": ...}.
+    """
+    try:
+        # Build before the first frame, off the event loop
+        model = await run_in_threadpool(_build_model, config)
     except Exception as e:
-        print("--- ERROR CAUGHT IN /simulation/run ---")
+        print("--- ERROR CAUGHT IN /simulation/stream ---")
         traceback.print_exc()
         print("------------------------------------")
         raise HTTPException(status_code=500, detail=str(e))
 
+    def frames():
+        try:
+            for state in _iter_steps(model, config):
+                yield json_encoder.encode({"type": "step", "state": state}) + b"\n"
+            result = _summarize(model, config, [])
+            yield json_encoder.encode({"type": "result", "result": result}) + b"\n"
+        except Exception as e:
+            # Headers are already sent, so report the failure in-band
+            print("--- ERROR CAUGHT IN /simulation/stream ---")
+            traceback.print_exc()
+            print("------------------------------------")
+            yield json_encoder.encode({"type": "error", "detail": str(e)}) + b"\n"
+        finally:
+            model.flush_blockchain()
+
+    return StreamingResponse(frames(), media_type="application/x-ndjson")
+
 def _run_comparison_leg(params: dict, steps: int) -> int:
     """Helper to run one leg of the comparison."""
+    model = None
     try:
         print(f"[QUEEN COMPARISON] Starting leg with params: {params}")
         np.random.seed(42)
@@ -390,6 +516,10 @@ def _run_comparison_leg(params: dict, steps: int) -> int:
     except Exception as e:
         print(f"[QUEEN COMPARISON] Error in comparison leg: {str(e)}")
         raise e
+    finally:
+        # Stops the blockchain worker threads the leg's food pickups started
+        if model is not None:
+            model.flush_blockchain()
 
 @app.post("/simulation/compare", response_model=ComparisonResult)
 async def compare_queen_performance(config: ComparisonConfig):
@@ -452,76 +582,56 @@ async def compare_queen_performance(config: ComparisonConfig):
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
+def _analyze_performance(config: SimulationConfig) -> PerformanceData:
+    """Runs a simulation and summarizes its performance data."""
+    model = _build_model(config)
+    try:
+        _run_steps(model, config.max_steps)
+    finally:
+        # Stops the blockchain worker threads once queued food records land
+        model.flush_blockchain()
+
+    # Calculate efficiency by agent type
+    total_llm_ants = sum(1 for ant in model.ants if ant.is_llm_controlled)
+    total_rule_ants = len(model.ants) - total_llm_ants
+
+    efficiency_by_type = {}
+    if total_llm_ants > 0:
+        efficiency_by_type["LLM"] = model.metrics["food_collected_by_llm"] / total_llm_ants
+    if total_rule_ants > 0:
+        efficiency_by_type["Rule-Based"] = model.metrics["food_collected_by_rule"] / total_rule_ants
+
+    # Pheromone summary
+    pheromone_summary = {
+        "total_trail": float(np.sum(model.pheromone_map['trail'])),
+        "total_alarm": float(np.sum(model.pheromone_map['alarm'])),
+        "total_recruitment": float(np.sum(model.pheromone_map['recruitment'])),
+        "max_trail": float(np.max(model.pheromone_map['trail'])),
+        "max_alarm": float(np.max(model.pheromone_map['alarm'])),
+        "max_recruitment": float(np.max(model.pheromone_map['recruitment']))
+    }
+
+    # Foraging hotspots
+    efficiency_data = convert_efficiency_data(model)
+    foraging_hotspots = efficiency_data.hotspot_locations
+
+    return PerformanceData(
+        food_collected_by_llm=model.metrics["food_collected_by_llm"],
+        food_collected_by_rule=model.metrics["food_collected_by_rule"],
+        total_api_calls=model.metrics["total_api_calls"],
+        efficiency_by_agent_type=efficiency_by_type,
+        pheromone_summary=pheromone_summary,
+        foraging_hotspots=foraging_hotspots
+    )
+
 @app.post("/simulation/performance", response_model=PerformanceData)
 async def get_performance_analysis(config: SimulationConfig):
     """
     Runs a simulation and returns focused performance data for analysis.
     """
     try:
-        np.random.seed(42)
-        random.seed(42)
-
-        model = SimpleForagingModel(
-            width=config.grid_width,
-            height=config.grid_height,
-            N_ants=config.n_ants,
-            N_food=config.n_food,
-            agent_type=config.agent_type,
-            with_queen=config.use_queen,
-            use_llm_queen=config.use_llm_queen,
-            selected_model_param=config.selected_model,
-            prompt_style_param=config.prompt_style,
-            N_predators=config.n_predators if config.enable_predators else 0,
-            predator_type=config.predator_type
-        )
-        
-        # Apply pheromone configuration
-        model.set_pheromone_params(
-            config.pheromone_decay_rate,
-            config.trail_deposit,
-            config.alarm_deposit,
-            config.recruitment_deposit,
-            config.max_pheromone_value,
-            config.fear_deposit
-        )
-        
-        for _ in range(config.max_steps):
-            if not model.foods:
-                break
-            model.step()
-
-        # Calculate efficiency by agent type
-        total_llm_ants = sum(1 for ant in model.ants if ant.is_llm_controlled)
-        total_rule_ants = len(model.ants) - total_llm_ants
-        
-        efficiency_by_type = {}
-        if total_llm_ants > 0:
-            efficiency_by_type["LLM"] = model.metrics["food_collected_by_llm"] / total_llm_ants
-        if total_rule_ants > 0:
-            efficiency_by_type["Rule-Based"] = model.metrics["food_collected_by_rule"] / total_rule_ants
-
-        # Pheromone summary
-        pheromone_summary = {
-            "total_trail": float(np.sum(model.pheromone_map['trail'])),
-            "total_alarm": float(np.sum(model.pheromone_map['alarm'])),
-            "total_recruitment": float(np.sum(model.pheromone_map['recruitment'])),
-            "max_trail": float(np.max(model.pheromone_map['trail'])),
-            "max_alarm": float(np.max(model.pheromone_map['alarm'])),
-            "max_recruitment": float(np.max(model.pheromone_map['recruitment']))
-        }
-
-        # Foraging hotspots
-        efficiency_data = convert_efficiency_data(model)
-        foraging_hotspots = efficiency_data.hotspot_locations
-
-        return PerformanceData(
-            food_collected_by_llm=model.metrics["food_collected_by_llm"],
-            food_collected_by_rule=model.metrics["food_collected_by_rule"],
-            total_api_calls=model.metrics["total_api_calls"],
-            efficiency_by_agent_type=efficiency_by_type,
-            pheromone_summary=pheromone_summary,
-            foraging_hotspots=foraging_hotspots
-        )
+        # Building, running and summarizing are all CPU work; keep them off the event loop
+        return await run_in_threadpool(_analyze_performance, config)
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
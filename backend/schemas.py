@@ -1,10 +1,15 @@
 # schemas.py
-from pydantic import BaseModel, Field
-from typing import List, Tuple, Dict, Literal, Optional
+from dataclasses import dataclass
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+from typing import List, Tuple, Dict, Literal, Optional, Union
+import msgspec
 import numpy as np
 
 class SimulationConfig(BaseModel):
     """Configuration for starting a simulation."""
+    # Unknown keys are ignored rather than forbidden: the frontend also sends blockchain_enabled
+    model_config = ConfigDict(frozen=True, extra='ignore')
+
     grid_width: int = Field(20, gt=0, description="Width of the simulation grid.")
     grid_height: int = Field(20, gt=0, description="Height of the simulation grid.")
     n_ants: int = Field(10, gt=0, description="Number of ants in the colony.")
@@ -29,8 +34,17 @@ class SimulationConfig(BaseModel):
     predator_type: Literal["LLM-Powered", "Rule-Based", "Hybrid"] = "LLM-Powered"
     fear_deposit: float = Field(3.0, ge=1.0, le=10.0, description="Fear pheromone deposit amount")
 
+    @model_validator(mode='after')
+    def check_food_fits_grid(self):
+        """Food piles occupy distinct cells, so there can be at most one per cell."""
+        if self.n_food > self.grid_width * self.grid_height:
+            raise ValueError(f"Cannot place {self.n_food} food piles on a {self.grid_width}x{self.grid_height} grid")
+        return self
+
 class AntState(BaseModel):
     """Represents the state of a single ant at a point in time."""
+    model_config = ConfigDict(frozen=True)
+
     id: int | str # Queen ID will be a string
     pos: Tuple[int, int]
     carrying_food: bool
@@ -40,6 +54,8 @@ class AntState(BaseModel):
 
 class PredatorState(BaseModel):
     """Represents the state of a single predator at a point in time."""
+    model_config = ConfigDict(frozen=True)
+
     id: int | str
     pos: Tuple[int, int]
     energy: int
@@ -47,13 +63,16 @@ class PredatorState(BaseModel):
     ants_caught: int
     hunt_cooldown: int
 
-class FoodDepletionPoint(BaseModel):
+@dataclass(frozen=True, slots=True)
+class FoodDepletionPoint:
     """Represents a point in the food depletion history."""
     step: int
     food_piles_remaining: int
 
 class PheromoneMapData(BaseModel):
     """Represents pheromone map data for visualization."""
+    model_config = ConfigDict(frozen=True)
+
     trail: List[List[float]]
     alarm: List[List[float]]
     recruitment: List[List[float]]
@@ -62,12 +81,16 @@ class PheromoneMapData(BaseModel):
 
 class ForagingEfficiencyData(BaseModel):
     """Represents foraging efficiency grid data."""
+    model_config = ConfigDict(frozen=True)
+
     efficiency_grid: List[List[float]]
     max_efficiency: float
     hotspot_locations: List[Tuple[int, int]]
 
 class StepState(BaseModel):
     """Represents the complete state of the simulation at a single step."""
+    model_config = ConfigDict(frozen=True)
+
     step: int
     ants: List[AntState]
     predators: List[PredatorState] = []  # Add predators with default empty list
@@ -79,7 +102,8 @@ class StepState(BaseModel):
     efficiency_data: Optional[ForagingEfficiencyData] = None
     nest_position: Tuple[int, int] = (10, 10)  # Default nest position
 
-class BlockchainTransaction(BaseModel):
+@dataclass(frozen=True, slots=True)
+class BlockchainTransaction:
     """Represents a single blockchain transaction with latency data."""
     tx_hash: str
     step: int
@@ -93,6 +117,8 @@ class BlockchainTransaction(BaseModel):
 
 class SimulationResult(BaseModel):
     """The final result of a full simulation run."""
+    model_config = ConfigDict(frozen=True)
+
     config: SimulationConfig
     total_steps_run: int
     final_metrics: Dict
@@ -110,12 +136,16 @@ class ComparisonConfig(SimulationConfig):
 
 class ComparisonResult(BaseModel):
     """Result of the Queen vs. No-Queen comparison."""
+    model_config = ConfigDict(frozen=True)
+
     food_collected_with_queen: int
     food_collected_no_queen: int
     config: ComparisonConfig
 
 class PerformanceData(BaseModel):
     """Performance metrics for charts and analysis."""
+    model_config = ConfigDict(frozen=True)
+
     food_collected_by_llm: int
     food_collected_by_rule: int
     total_api_calls: int
@@ -130,8 +160,65 @@ class ChartDataRequest(BaseModel):
 
 class PheromoneConfigUpdate(BaseModel):
     """Update pheromone parameters during simulation."""
+    model_config = ConfigDict(frozen=True)
+
     decay_rate: float = Field(ge=0.01, le=0.2)
     trail_deposit: float = Field(ge=0.1, le=5.0)
     alarm_deposit: float = Field(ge=0.1, le=5.0)
     recruitment_deposit: float = Field(ge=0.1, le=5.0)
-    max_value: float = Field(ge=5.0, le=20.0)
\ No newline at end of file
+    max_value: float = Field(ge=5.0, le=20.0)
+
+# --- msgspec history records ---
+# The Pydantic models above describe the API contract (request validation and
+# OpenAPI docs). The per-step history is internal, append-only data, so it is
+# collected with these lightweight structs and encoded directly by msgspec.
+# Field names mirror the Pydantic models so the JSON wire format is unchanged.
+
+class AntStateStruct(msgspec.Struct, kw_only=True):
+    """Lightweight history record for a single ant."""
+    id: int | str
+    pos: Tuple[int, int]
+    carrying_food: bool
+    is_llm: bool
+    is_queen: bool = False
+    steps_since_food: Optional[int] = None
+
+class PredatorStateStruct(msgspec.Struct, kw_only=True):
+    """Lightweight history record for a single predator."""
+    id: int | str
+    pos: Tuple[int, int]
+    energy: int
+    is_llm: bool
+    ants_caught: int
+    hunt_cooldown: int
+
+# Grids hold pre-encoded JSON (msgspec.Raw) or, for msgpack, a packed
+# float32 {"shape", "data"} dict; see grid_to_json / grid_to_packed in main.py
+EncodedGrid = Union[msgspec.Raw, dict]
+
+class PheromoneMapStruct(msgspec.Struct, kw_only=True):
+    """Lightweight pheromone map snapshot."""
+    trail: EncodedGrid
+    alarm: EncodedGrid
+    recruitment: EncodedGrid
+    fear: EncodedGrid
+    max_values: Dict[str, float]
+
+class ForagingEfficiencyStruct(msgspec.Struct, kw_only=True):
+    """Lightweight foraging efficiency snapshot."""
+    efficiency_grid: EncodedGrid
+    max_efficiency: float
+    hotspot_locations: List[Tuple[int, int]]
+
+class StepStateStruct(msgspec.Struct, kw_only=True):
+    """Lightweight history record for a single simulation step."""
+    step: int
+    ants: List[AntStateStruct]
+    predators: List[PredatorStateStruct] = []
+    food_positions: List[Tuple[int, int]]
+    metrics: Dict
+    queen_report: str
+    errors: List[str]
+    pheromone_data: Optional[PheromoneMapStruct] = None
+    efficiency_data: Optional[ForagingEfficiencyStruct] = None
+    nest_position: Tuple[int, int] = (10, 10)
@@ -0,0 +1,84 @@
+# sim_kernels.py
+"""Numba-compiled kernels for the simulation's numeric hot paths.
+
+Numba is optional: when it is not installed NUMBA_AVAILABLE is False and
+the simulation keeps using its pure-Python code paths.
+"""
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    print("⚠️ numba not installed, using pure-Python simulation kernels")
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in so the kernels below can still be defined without numba."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda fn: fn
+
+
+@njit
+def step_toward(x, y, tx, ty, width, height):
+    """Returns the in-bounds neighbor of (x, y) closest to (tx, ty) by Manhattan distance.
+
+    Neighbors are scanned in the same order as SimpleForagingModel.get_neighborhood,
+    so ties resolve identically. Returns (x, y) when there are no neighbors.
+    """
+    best_x, best_y, best_d = x, y, -1
+    for dx in range(-1, 2):
+        for dy in range(-1, 2):
+            if dx == 0 and dy == 0:
+                continue
+            nx, ny = x + dx, y + dy
+            if nx < 0 or nx >= width or ny < 0 or ny >= height:
+                continue
+            d = abs(nx - tx) + abs(ny - ty)
+            if best_d < 0 or d < best_d:
+                best_x, best_y, best_d = nx, ny, d
+    return best_x, best_y
+
+
+@njit
+def escape_step(x, y, px, py, width, height):
+    """Returns the cell among (x, y)'s in-bounds neighbors and (x, y) itself farthest from (px, py).
+
+    Candidates are scanned neighbors first, then the current cell, so ties resolve
+    like max(get_neighborhood(x, y) + [(x, y)], key=...).
+    """
+    best_x, best_y, best_d = x, y, -1
+    for dx in range(-1, 2):
+        for dy in range(-1, 2):
+            if dx == 0 and dy == 0:
+                continue
+            nx, ny = x + dx, y + dy
+            if nx < 0 or nx >= width or ny < 0 or ny >= height:
+                continue
+            d = abs(nx - px) + abs(ny - py)
+            if d > best_d:
+                best_x, best_y, best_d = nx, ny, d
+    if abs(x - px) + abs(y - py) > best_d:
+        best_x, best_y = x, y
+    return best_x, best_y
+
+
+@njit
+def rule_step(x, y, carrying, foods_xy, width, height, home_x, home_y):
+    """Rule-based move for one ant: head home when carrying, else toward the nearest food.
+
+    Returns (-1, -1) when there is no food left to head for, so the caller can
+    pick a random neighbor with the simulation's RNG.
+    """
+    if carrying:
+        return step_toward(x, y, home_x, home_y, width, height)
+    n = foods_xy.shape[0]
+    if n == 0:
+        return -1, -1
+    best_i = 0
+    best_d = abs(foods_xy[0, 0] - x) + abs(foods_xy[0, 1] - y)
+    for i in range(1, n):
+        d = abs(foods_xy[i, 0] - x) + abs(foods_xy[i, 1] - y)
+        if d < best_d:
+            best_i, best_d = i, d
+    return step_toward(x, y, foods_xy[best_i, 0], foods_xy[best_i, 1], width, height)
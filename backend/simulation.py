@@ -2,12 +2,23 @@
 import numpy as np
 import os
 import openai
-import random
-from random import choice
 import json
+import random
+import secrets
 from dotenv import load_dotenv
 import asyncio
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+try:
+    from backend.sim_kernels import NUMBA_AVAILABLE, escape_step, rule_step, step_toward
+    from backend.schemas import BlockchainTransaction, FoodDepletionPoint
+except ImportError:
+    # Fallback for local development
+    from sim_kernels import NUMBA_AVAILABLE, escape_step, rule_step, step_toward
+    from schemas import BlockchainTransaction, FoodDepletionPoint
 
 # Load environment variables
 load_dotenv()
@@ -35,27 +46,379 @@ except ImportError:
     print("⚠️ mistralai not installed")
     mistral_client = None
 
+try:
+    from scipy import ndimage
+except ImportError:
+    print("⚠️ scipy not installed, nearest-food search falls back to NumPy")
+    ndimage = None
+
+try:
+    import httpx
+except ImportError:
+    print("⚠️ httpx not installed, LLM clients use their default connection handling")
+    httpx = None
+
 # OpenAI client for GPT models
 openai_client = None
 if OPENAI_API_KEY:
     openai_client = openai.OpenAI(api_key=OPENAI_API_KEY)
     print("✅ OpenAI client configured")
 
+# Fail fast on connect so a stalled LLM endpoint falls back to rule-based behavior quickly
+IO_CONNECT_TIMEOUT = 2.0
+_io_client = None
+# Models are built on request worker threads; only one of them may create the client
+_io_client_lock = threading.Lock()
+
+def get_io_client():
+    """Returns the process-wide IO Intelligence client, creating it on first use.
+
+    Sharing one client (and its keep-alive connection pool) across simulation
+    runs and worker threads avoids a new TCP/TLS handshake per model.
+    """
+    global _io_client
+    if _io_client is None:
+        with _io_client_lock:
+            if _io_client is None:
+                http_client = None
+                if httpx:
+                    try:
+                        import h2  # noqa: F401  (enables HTTP/2 in httpx)
+                        http2 = True
+                    except ImportError:
+                        http2 = False
+                    http_client = httpx.Client(
+                        http2=http2,
+                        limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+                        timeout=httpx.Timeout(10.0, connect=IO_CONNECT_TIMEOUT),
+                    )
+                _io_client = openai.OpenAI(
+                    api_key=IO_API_KEY,
+                    base_url="https://api.intelligence.io.solutions/api/v1/",
+                    http_client=http_client
+                )
+    return _io_client
+
+def read_json_object_stream(stream):
+    """Reads a streamed chat completion until its first top-level JSON object closes.
+
+    Returns the text received up to and including the closing brace (or all of it
+    if the object never closes), then closes the stream to skip the remaining tokens.
+    """
+    parts = []
+    depth = 0
+    in_string = escaped = False
+    try:
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            text = chunk.choices[0].delta.content or ""
+            for i, ch in enumerate(text):
+                if in_string:
+                    if escaped:
+                        escaped = False
+                    elif ch == '\\':
+                        escaped = True
+                    elif ch == '"':
+                        in_string = False
+                elif ch == '"' and depth:
+                    in_string = True
+                elif ch == '{':
+                    depth += 1
+                elif ch == '}' and depth:
+                    depth -= 1
+                    if not depth:
+                        parts.append(text[:i + 1])
+                        return "".join(parts)
+            parts.append(text)
+    finally:
+        close = getattr(stream, "close", None)
+        if close:
+            close()
+    return "".join(parts)
+
+def close_io_client():
+    """Closes the shared IO Intelligence client and its connection pool, if created."""
+    global _io_client
+    with _io_client_lock:
+        if _io_client is not None:
+            _io_client.close()
+            _io_client = None
+
+_llm_executor = None
+_llm_executor_lock = threading.Lock()
+
+def get_llm_executor():
+    """Returns the process-wide worker pool for concurrent LLM requests.
+
+    Kept alive across steps and runs so threads (and their warm connections)
+    are reused; its size also caps concurrent requests across simulations.
+    """
+    global _llm_executor
+    if _llm_executor is None:
+        with _llm_executor_lock:
+            if _llm_executor is None:
+                _llm_executor = ThreadPoolExecutor(max_workers=LLM_MAX_CONCURRENCY, thread_name_prefix="llm")
+    return _llm_executor
+
+def shutdown_llm_executor():
+    """Stops the shared LLM worker pool, if created."""
+    global _llm_executor
+    with _llm_executor_lock:
+        if _llm_executor is not None:
+            _llm_executor.shutdown(wait=False, cancel_futures=True)
+            _llm_executor = None
+
+# Food transactions awaiting their receipt concurrently, per simulation
+BLOCKCHAIN_RECEIPT_WORKERS = 8
+# Log only every Nth failed on-chain record (the first is always logged)
+BLOCKCHAIN_ERROR_LOG_EVERY = 50
+# Seconds a fetched gas price is reused before asking the chain again
+GAS_PRICE_TTL = 10.0
+# Chain id, next nonce and gas price shared by every simulation's on-chain records,
+# so each transaction needs no extra RPCs; the nonce resyncs after a failure
+_chain_lock = threading.Lock()
+_chain_cache = {"chain_id": None, "nonce": None, "gas_price": 0, "gas_price_time": 0.0}
+
+@lru_cache(maxsize=1)
+def _load_blockchain_client():
+    """Imports blockchain.client once per process, returning (module, None) or (None, error).
+
+    A failed import is not kept in sys.modules, so without this every food pickup
+    would re-run the client's .env parsing and RPC connection attempt.
+    """
+    try:
+        import blockchain.client as client
+        return client, None
+    except Exception as e:
+        return None, e
+
+def next_tx_params(w3, address):
+    """Returns (chain_id, nonce, gas_price) for the next transaction from address."""
+    with _chain_lock:
+        cache = _chain_cache
+        if cache["chain_id"] is None:
+            cache["chain_id"] = w3.eth.chain_id
+        if cache["nonce"] is None:
+            # 'pending' includes transactions not yet mined
+            cache["nonce"] = w3.eth.get_transaction_count(address, 'pending')
+        now = time.time()
+        if now - cache["gas_price_time"] > GAS_PRICE_TTL:
+            # 10% buffer over the current price to avoid underpricing
+            cache["gas_price"] = int(w3.eth.gas_price * 1.1)
+            cache["gas_price_time"] = now
+        nonce = cache["nonce"]
+        cache["nonce"] += 1
+        return cache["chain_id"], nonce, cache["gas_price"]
+
+def reset_tx_nonce():
+    """Forgets the local nonce so the next transaction reads it from the chain."""
+    with _chain_lock:
+        _chain_cache["nonce"] = None
+
+ANT_ACTIONS = ("toward", "random", "stay")
+# Upper bound on concurrent per-ant LLM requests, to stay within provider rate limits
+LLM_MAX_CONCURRENCY = 32
+# Ants per batched decision request; larger prompts give diminishing returns
+LLM_BATCH_SIZE = 8
+
+# Distinct Queen situations whose LLM guidance is remembered
+QUEEN_CACHE_SIZE = 128
+# Cells whose neighbor lists each model keeps; enough for a busy colony's
+# working set without growing with the grid
+NEIGHBORHOOD_CACHE_SIZE = 4096
+
+# Prompts are split into a static system prompt, built once per model so every
+# request shares an identical prefix the provider can cache, and a one-line state.
+PHEROMONE_LEGEND = (
+    "Local pheromones are averages over radius 2: trail=good path, alarm=danger, "
+    "recruitment=help needed, fear=predators (avoid!)."
+)
+ANT_STATE_FORMAT = (
+    "State lines give: pos, food_nearby (food within one cell), carrying, collected "
+    "(food collected so far), trail, alarm, recruitment, fear, predators_nearby."
+)
+ANT_STYLE_GUIDANCE = {
+    "Structured": "PRIORITY: Avoid areas with high fear pheromone (predators).",
+    "Autonomous": "You decide autonomously. Survival is priority #1 - avoid fear pheromone areas.",
+    "Adaptive": "Follow trails, avoid alarms/fear (predators!), respond to recruitment. "
+                "Stay alive first, then collect food.",
+}
+
+def build_ant_system_prompt(width, height, prompt_style):
+    """Static instructions for a single ant's decision in the given prompt style."""
+    return (
+        f"You are an intelligent ant foraging on a {width}x{height} grid. {ANT_STATE_FORMAT} "
+        f"{PHEROMONE_LEGEND} {ANT_STYLE_GUIDANCE[prompt_style]} "
+        "Actions: 'toward' (move toward food), 'random' (explore), 'stay'. "
+        "Respond with one word: toward, random, or stay."
+    )
+
+def build_colony_system_prompt(width, height):
+    """Static instructions for a batched decision covering several ants."""
+    return (
+        f"You coordinate a colony of foraging ants on a {width}x{height} grid. "
+        f"Each ant is given as 'Ant <id>: <state>'. {ANT_STATE_FORMAT} {PHEROMONE_LEGEND} "
+        "For each ant choose 'toward' food, 'random', or 'stay'. "
+        'Respond only with valid JSON mapping ant id to action, e.g. {"0": "toward", "1": "stay"}.'
+    )
+
+def build_queen_system_prompt(width, height):
+    """Static instructions for the Queen's colony-wide guidance request."""
+    return (
+        f"You are a Queen Ant guiding your worker ants efficiently on a {width}x{height} grid. "
+        "The colony state gives: step, ants, food (piles remaining), and the peak trail "
+        "(success paths), alarm (problems) and recruitment (help needed) pheromone as value@(x,y). "
+        "Ant lines give pos, carrying, and nearby_food (food within 2 cells). "
+        "Respond only with valid JSON: "
+        '{"guidance": {"0": [x,y], "1": [x,y]}, "report": "brief status"}'
+    )
+
+def format_ant_observation(ant, food_nearby, local_pheromones, nearby_predators):
+    """Compact one-line ant state for the user message."""
+    x, y = ant.pos
+    return (
+        f"pos=({x},{y}) food_nearby={food_nearby} carrying={ant.carrying_food} "
+        f"collected={ant.food_collected_count} "
+        f"trail={local_pheromones['trail']:.2f} alarm={local_pheromones['alarm']:.2f} "
+        f"recruitment={local_pheromones['recruitment']:.2f} fear={local_pheromones.get('fear', 0):.2f} "
+        f"predators_nearby={len(nearby_predators)}"
+    )
+
+PREDATOR_ACTIONS = ("hunt", "patrol", "rest")
+
+def parse_action(reply, actions):
+    """Returns the action a one-word reply names, or None.
+
+    Models often wrap the word in quotes, capitalize it or add a full stop
+    ("'Toward'.", "Stay."); those still count instead of wasting the call.
+    """
+    if not reply:
+        return None
+    words = str(reply).split()
+    if not words:
+        return None
+    action = words[0].strip("'\"`.,:;!*").lower()
+    return action if action in actions else None
+
+PREDATOR_STATE_FORMAT = (
+    "State lines give: pos, nearby_ants (within 3 cells), energy (out of 100), hunt_cooldown, "
+    "caught (ants caught so far), success_rate, and local fear and trail pheromone "
+    "(high fear means you've been here recently; trail indicates ant activity)."
+)
+PREDATOR_STYLE_GUIDANCE = {
+    "Structured": "Decide whether to hunt ants, patrol territory, or rest.",
+    "Autonomous": "You decide autonomously. Consider energy management and territorial coverage.",
+    "Adaptive": "Adapt based on your success rate and current conditions.",
+}
+
+def build_predator_system_prompt(width, height, prompt_style):
+    """Static instructions for a predator's decision in the given prompt style."""
+    return (
+        f"You are an intelligent predator hunting ants on a {width}x{height} grid. "
+        f"{PREDATOR_STATE_FORMAT} {PREDATOR_STYLE_GUIDANCE[prompt_style]} "
+        "Respond with only one word: hunt, patrol, or rest."
+    )
+
+def format_predator_observation(predator, nearby_ants, local_pheromones):
+    """Compact one-line predator state for the user message."""
+    x, y = predator.pos
+    success_rate = predator.ants_caught / max(1, len(predator.move_history))
+    return (
+        f"pos=({x},{y}) nearby_ants={len(nearby_ants)} energy={predator.energy} "
+        f"hunt_cooldown={predator.hunt_cooldown} caught={predator.ants_caught} "
+        f"success_rate={success_rate:.2f} fear={local_pheromones.get('fear', 0):.2f} "
+        f"trail={local_pheromones.get('trail', 0):.2f}"
+    )
+
+@lru_cache(maxsize=8)
+def _gemini_model(model_name):
+    """Shared GenerativeModel per Gemini model name, built on first use."""
+    return genai.GenerativeModel(model_name)
+
+@lru_cache(maxsize=8)
+def _gemini_generation_config(temperature, max_tokens):
+    """Shared GenerationConfig per (temperature, max_tokens) pair."""
+    return genai.types.GenerationConfig(temperature=temperature, max_output_tokens=max_tokens)
+
+def chat_completion(selected_model_param, system_prompt, user_prompt, io_client=None,
+                    temperature=0.3, max_tokens=10, timeout=10):
+    """Route a chat request to the provider matching the model name.
+
+    Returns the stripped reply text, or None if no client is available for the model.
+    """
+    # OpenAI models (gpt-4o, gpt-4o-mini)
+    if selected_model_param.startswith("gpt-") and openai_client:
+        response = openai_client.chat.completions.create(
+            model=selected_model_param,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            temperature=temperature,
+            max_tokens=max_tokens,
+            timeout=timeout
+        )
+        return response.choices[0].message.content.strip()
+
+    # Gemini models
+    elif selected_model_param.startswith("gemini-") and genai:
+        response = _gemini_model(selected_model_param).generate_content(
+            f"{system_prompt}\n\n{user_prompt}",
+            generation_config=_gemini_generation_config(temperature, max_tokens)
+        )
+        return response.text.strip()
+
+    # Mistral models
+    elif selected_model_param.startswith("mistral-") and mistral_client:
+        response = mistral_client.chat.complete(
+            model=selected_model_param,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            temperature=temperature,
+            max_tokens=max_tokens
+        )
+        return response.choices[0].message.content.strip()
+
+    # DeepSeek and other IO.NET models (meta-llama, etc.), OpenAI-compatible
+    elif io_client:
+        response = io_client.chat.completions.create(
+            model=selected_model_param,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            temperature=temperature,
+            max_completion_tokens=max_tokens,
+            timeout=httpx.Timeout(timeout, connect=IO_CONNECT_TIMEOUT) if httpx else timeout
+        )
+        return response.choices[0].message.content.strip()
+
+    return None
+
 class SimpleAntAgent:
-    def __init__(self, unique_id, model, is_llm_controlled=True):
+    __slots__ = ('unique_id', 'model', 'carrying_food', 'pos', 'is_llm_controlled',
+                 'move_history', '_hist_idx', 'food_collected_count', 'steps_since_food', 'pending_action')
+
+    def __init__(self, unique_id, model, is_llm_controlled=True, pos=None):
         self.unique_id = unique_id
         self.model = model
         self.carrying_food = False
-        self.pos = (np.random.randint(model.width), np.random.randint(model.height))
+        self.pos = pos if pos is not None else model.random_positions(1)[0]
         self.is_llm_controlled = is_llm_controlled
-        self.api_calls = 0
-        self.move_history = []
+        # Visited positions; grows by doubling, only the first _hist_idx rows are valid
+        self.move_history = np.empty((64, 2), dtype=np.int16)
+        self._hist_idx = 0
         self.food_collected_count = 0
         self.steps_since_food = 0  # For recruitment pheromone
+        self.pending_action = None  # Prefilled by the model's batched LLM request
 
     def step(self, guided_pos=None):
+        action, self.pending_action = self.pending_action, None
         x, y = self.pos
-        possible_steps = self.model.get_neighborhood(x, y)
+        possible_steps = None  # Looked up only on the branches that need it
         new_position = self.pos
 
         # Pheromone deposition before moving (based on current state)
@@ -73,36 +436,45 @@ class SimpleAntAgent:
             # Check for immediate predator threat (second priority)
             nearby_predators = [p for p in self.model.predators 
                                if abs(p.pos[0] - x) <= 2 and abs(p.pos[1] - y) <= 2]
-            
+            if nearby_predators:
+                possible_steps = self.model.get_neighborhood(x, y)
+
             if nearby_predators and possible_steps:
                 # ESCAPE! Move away from nearest predator
                 nearest_predator = min(nearby_predators, 
                                      key=lambda p: abs(p.pos[0] - x) + abs(p.pos[1] - y))
                 # Find position that maximizes distance from predator
-                escape_pos = max(possible_steps + [self.pos], 
-                               key=lambda pos: abs(pos[0] - nearest_predator.pos[0]) + abs(pos[1] - nearest_predator.pos[1]))
+                if NUMBA_AVAILABLE:
+                    px, py = nearest_predator.pos
+                    ex, ey = escape_step(x, y, px, py, self.model.width, self.model.height)
+                    escape_pos = (int(ex), int(ey))
+                else:
+                    escape_pos = max(possible_steps + [self.pos], 
+                                   key=lambda pos: abs(pos[0] - nearest_predator.pos[0]) + abs(pos[1] - nearest_predator.pos[1]))
                 new_position = escape_pos
                 # Deposit alarm pheromone when escaping
                 self.model.deposit_pheromone(self.pos, 'alarm', self.model.alarm_deposit * 2)
-            elif guided_pos and guided_pos in possible_steps + [self.pos]:
+            elif guided_pos and self._is_reachable(guided_pos):
                 # Queen guidance takes priority (when not escaping)
                 new_position = guided_pos
             elif self.is_llm_controlled and self.model.io_client and self.model.api_enabled:
+                possible_steps = self.model.get_neighborhood(x, y)
                 try:
-                    action = self.ask_io_for_decision(self.model.prompt_style, self.model.selected_model)
-                    self.api_calls += 1
+                    if action is None:
+                        # Not covered by this step's batched request
+                        action = self.ask_io_for_decision(self.model.prompt_style, self.model.selected_model)
                     if action == "toward" and possible_steps:
                         target_food = self._find_nearest_food()
                         if target_food:
-                            new_position = self._step_toward(self.pos, target_food)
+                            new_position = self._step_toward(self.pos, target_food, possible_steps)
                         else:
-                            new_position = choice(possible_steps)
+                            new_position = self.model.random_choice(possible_steps)
                     elif action == "random" and possible_steps:
-                        new_position = choice(possible_steps)
+                        new_position = self.model.random_choice(possible_steps)
                     elif action == "stay":
                         new_position = self.pos
                     else:
-                        new_position = choice(possible_steps) if possible_steps else self.pos
+                        new_position = self.model.random_choice(possible_steps) if possible_steps else self.pos
                 except Exception as e:
                     # Deposit alarm pheromone on API error
                     self.model.deposit_pheromone(self.pos, 'alarm', self.model.alarm_deposit * 1.5)
@@ -110,9 +482,13 @@ class SimpleAntAgent:
                     new_position = self._use_rule_based_behavior(possible_steps)
             else:
                 # Rule-based behavior
+                possible_steps = self.model.get_neighborhood(x, y)
                 new_position = self._use_rule_based_behavior(possible_steps)
 
-        self.move_history.append(self.pos)
+        if self._hist_idx == len(self.move_history):
+            self.move_history = np.concatenate([self.move_history, np.empty_like(self.move_history)])
+        self.move_history[self._hist_idx] = self.pos
+        self._hist_idx += 1
         self.pos = new_position
 
         # Food pickup/drop logic
@@ -135,47 +511,71 @@ class SimpleAntAgent:
             home = (self.model.width // 2, self.model.height // 2)
             # Drop food if at home position or very close to it
             if abs(self.pos[0] - home[0]) <= 1 and abs(self.pos[1] - home[1]) <= 1:
-                if random.random() < 0.3:  # 30% chance to drop at home
+                if self.model.random() < 0.3:  # 30% chance to drop at home
                     self.carrying_food = False
                     # Deposit trail pheromone at nest when dropping food
                     self.model.deposit_pheromone(self.pos, 'trail', self.model.trail_deposit * 1.5)
 
+    def get_move_history(self):
+        """Returns the positions visited so far as an (n_steps, 2) int16 array."""
+        return self.move_history[:self._hist_idx]
+
     def _use_rule_based_behavior(self, possible_steps):
         """Enhanced rule-based behavior with home/nest awareness"""
         if self.model.is_food_at(self.pos) and not self.carrying_food:
             return self.pos  # Stay to pick up food
+        elif NUMBA_AVAILABLE:
+            # Compiled nearest-food / step-toward kernel (home is the grid center)
+            x, y = self.pos
+            width, height = self.model.width, self.model.height
+            nx, ny = rule_step(x, y, self.carrying_food, self.model.get_food_array(),
+                               width, height, width // 2, height // 2)
+            if nx >= 0:
+                return (int(nx), int(ny))
+            return self.model.random_choice(possible_steps) if possible_steps else self.pos
         elif self.carrying_food:
             # Move towards nest/home (center of grid)
             home = (self.model.width // 2, self.model.height // 2)
-            return self._step_toward(self.pos, home)
+            return self._step_toward(self.pos, home, possible_steps)
         else:
             # Look for nearest food and move towards it, or move randomly
             target_food = self._find_nearest_food()
             if target_food:
-                return self._step_toward(self.pos, target_food)
+                return self._step_toward(self.pos, target_food, possible_steps)
             else:
-                return choice(possible_steps) if possible_steps else self.pos
+                return self.model.random_choice(possible_steps) if possible_steps else self.pos
 
     def _find_nearest_food(self):
-        if not self.model.foods:
-            return None
-        return min(self.model.foods,
-                   key=lambda f: abs(f[0]-self.pos[0]) + abs(f[1]-self.pos[1]))
+        return self.model.nearest_food(self.pos)
 
-    def _step_toward(self, start, target):
+    def _is_reachable(self, pos):
+        """True if pos is the current cell or an in-bounds neighbor of it.
+
+        LLM guidance can name non-integer cells (e.g. [3.5, 4]); those are rejected.
+        """
+        x, y = pos
+        if type(x) is not int or type(y) is not int:
+            return False
+        return (0 <= x < self.model.width and 0 <= y < self.model.height
+                and abs(x - self.pos[0]) <= 1 and abs(y - self.pos[1]) <= 1)
+
+    def _step_toward(self, start, target, possible_moves=None):
         x, y = start
         tx, ty = target
-        possible_moves = self.model.get_neighborhood(x, y)
+        if NUMBA_AVAILABLE:
+            # Same scan order as get_neighborhood, so ties resolve identically
+            nx, ny = step_toward(x, y, tx, ty, self.model.width, self.model.height)
+            return (int(nx), int(ny))
+        if possible_moves is None:
+            possible_moves = self.model.get_neighborhood(x, y)
         if not possible_moves:
             return start
         return min(possible_moves, key=lambda n: abs(n[0]-tx)+abs(n[1]-ty))
 
-    def ask_io_for_decision(self, prompt_style_param, selected_model_param):
+    def _observe(self):
+        """Returns (food_nearby, local_pheromones, nearby_predators) for LLM prompts."""
         x, y = self.pos
-        food_nearby = any(
-            abs(fx - x) <= 1 and abs(fy - y) <= 1
-            for fx, fy in self.model.get_food_positions()
-        )
+        food_nearby = self.model.food_within_radius(x, y)
         
         # Get local pheromone information
         local_pheromones = self.model.get_local_pheromones(self.pos, radius=2)
@@ -183,136 +583,61 @@ class SimpleAntAgent:
         # Check for nearby predators
         nearby_predators = [p for p in self.model.predators 
                            if abs(p.pos[0] - x) <= 3 and abs(p.pos[1] - y) <= 3]
-        
-        pheromone_info = (
-            f"Local Pheromones (radius 2): "
-            f"Trail: {local_pheromones['trail']:.2f}, "
-            f"Alarm: {local_pheromones['alarm']:.2f}, "
-            f"Recruitment: {local_pheromones['recruitment']:.2f}, "
-            f"Fear: {local_pheromones.get('fear', 0):.2f}. "
-            f"Predators nearby: {len(nearby_predators)}. "
+        return food_nearby, local_pheromones, nearby_predators
+
+    def _decision_key(self, prompt_style_param, selected_model_param, food_nearby, local_pheromones, nearby_predators):
+        """Key for the decision cache, with pheromone levels bucketed to steps of 0.5.
+
+        The decision depends on little real state, so ants in the same situation share answers.
+        """
+        return (
+            prompt_style_param, selected_model_param, food_nearby, self.carrying_food,
+            bool(self.model.foods), len(nearby_predators),
+            *(round(local_pheromones.get(p, 0) * 2) for p in ('trail', 'alarm', 'recruitment', 'fear'))
         )
 
-        if prompt_style_param == "Structured":
-            prompt = (
-                f"You are an ant at position ({x},{y}) on a {self.model.width}x{self.model.height} grid. "
-                f"Food nearby: {food_nearby}. Carrying food: {self.carrying_food}. "
-                f"{pheromone_info}"
-                "Should you move 'toward' food, move 'random', or 'stay'? "
-                "Consider: High trail=good path, high alarm=danger, high recruitment=help needed, high fear=predators! "
-                "PRIORITY: Avoid areas with high fear pheromone (predators). "
-                "Reply with only one word: 'toward', 'random', or 'stay'."
-            )
-        elif prompt_style_param == "Autonomous":
-            prompt = (
-                f"As an autonomous ant foraging for food, my current state is: "
-                f"Position: ({x},{y}), "
-                f"Food available nearby: {food_nearby}, "
-                f"Currently carrying food: {self.carrying_food}. "
-                f"{pheromone_info}"
-                "What is the best action? Choose: 'toward', 'random', or 'stay'. "
-                "Pheromone signals: Trail=good path, alarm=danger, recruitment=help needed, fear=PREDATORS (avoid!). "
-                "Survival is priority #1 - avoid fear pheromone areas."
-            )
-        else:  # Adaptive
-            efficiency = self.food_collected_count
-            prompt = (
-                f"Ant {self.unique_id} has collected {efficiency} food items. "
-                f"Current position: ({x},{y}). "
-                f"Food nearby: {food_nearby}. "
-                f"Carrying food: {self.carrying_food}. "
-                f"{pheromone_info}"
-                "Best action? Options: 'toward', 'random', 'stay'. "
-                "Pheromone guide: Follow trails, avoid alarms/fear (predators!), respond to recruitment. "
-                "Stay alive first, then collect food."
-            )
+    def ask_io_for_decision(self, prompt_style_param, selected_model_param):
+        food_nearby, local_pheromones, nearby_predators = self._observe()
+
+        cache_key = self._decision_key(
+            prompt_style_param, selected_model_param, food_nearby, local_pheromones, nearby_predators
+        )
+        cached_action = self.model._decision_cache.get(cache_key)
+        if cached_action is not None:
+            with self.model._llm_lock:
+                self.model.metrics["cached_decisions"] += 1
+            return cached_action
+        
+        # Static instructions live in the cached system prompt; only the state varies
+        system_prompt = self.model._ant_system_prompts.get(
+            prompt_style_param, self.model._ant_system_prompts["Adaptive"]
+        )
+        prompt = format_ant_observation(self, food_nearby, local_pheromones, nearby_predators)
 
         try:
-            # Route to appropriate model API based on model name
-            action = None
-            
-            # OpenAI models (gpt-4o, gpt-4o-mini)
-            if selected_model_param.startswith("gpt-") and openai_client:
-                response = openai_client.chat.completions.create(
-                    model=selected_model_param,
-                    messages=[
-                        {"role": "system", "content": "You are an intelligent ant. Respond with one word: toward, random, or stay."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=0.3,
-                    max_tokens=10,
-                    timeout=10
-                )
-                action = response.choices[0].message.content.strip().lower()
-            
-            # Gemini models
-            elif selected_model_param.startswith("gemini-") and genai:
-                model = genai.GenerativeModel(selected_model_param)
-                response = model.generate_content(
-                    f"You are an intelligent ant. Respond with one word: toward, random, or stay.\n\n{prompt}",
-                    generation_config=genai.types.GenerationConfig(
-                        temperature=0.3,
-                        max_output_tokens=10,
-                    )
-                )
-                action = response.text.strip().lower()
-            
-            # Mistral models
-            elif selected_model_param.startswith("mistral-") and mistral_client:
-                response = mistral_client.chat.complete(
-                    model=selected_model_param,
-                    messages=[
-                        {"role": "system", "content": "You are an intelligent ant. Respond with one word: toward, random, or stay."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=0.3,
-                    max_tokens=10
-                )
-                action = response.choices[0].message.content.strip().lower()
-            
-            # DeepSeek models (OpenAI-compatible via IO.NET)
-            elif selected_model_param.startswith("deepseek-") and self.model.io_client:
-                response = self.model.io_client.chat.completions.create(
-                    model=selected_model_param,
-                    messages=[
-                        {"role": "system", "content": "You are an intelligent ant. Respond with one word: toward, random, or stay."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=0.3,
-                    max_completion_tokens=10,
-                    timeout=10
-                )
-                action = response.choices[0].message.content.strip().lower()
-            
-            # IO.NET models (meta-llama, etc.)
-            elif self.model.io_client:
-                response = self.model.io_client.chat.completions.create(
-                    model=selected_model_param,
-                    messages=[
-                        {"role": "system", "content": "You are an intelligent ant. Respond with one word: toward, random, or stay."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=0.3,
-                    max_completion_tokens=10,
-                    timeout=10
-                )
-                action = response.choices[0].message.content.strip().lower()
+            with self.model._llm_lock:
+                self.model.metrics["total_api_calls"] += 1
+            reply = chat_completion(selected_model_param, system_prompt, prompt, io_client=self.model.io_client)
+            action = parse_action(reply, ANT_ACTIONS)
             
             # Return valid action or default to random
-            return action if action in ["toward", "random", "stay"] else "random"
+            if action:
+                self.model._decision_cache[cache_key] = action
+                return action
+            return "random"
             
         except Exception as e:
-            # Deposit alarm pheromone on API error
+            # Deposit alarm pheromone on API error (queued while the model fans out requests)
             self.model.deposit_pheromone(self.pos, 'alarm', self.model.alarm_deposit * 1.5)
             self.model.log_error(f"LLM call failed for Ant {self.unique_id} with model {selected_model_param}: {str(e)}")
             return "random"
 
 # Predator agent class
 class PredatorAgent:
-    def __init__(self, unique_id, model, is_llm_controlled=True):
+    def __init__(self, unique_id, model, is_llm_controlled=True, pos=None):
         self.unique_id = unique_id
         self.model = model
-        self.pos = (np.random.randint(model.width), np.random.randint(model.height))
+        self.pos = pos if pos is not None else model.random_positions(1)[0]
         self.is_llm_controlled = is_llm_controlled
         self.api_calls = 0
         self.energy = 100  # Energy for hunting
@@ -320,8 +645,10 @@ class PredatorAgent:
         self.ants_caught = 0
         self.move_history = []
         self.hunting_range = 2  # How close predator needs to be to catch ant
+        self.pending_action = None  # Prefilled by the model's concurrent LLM requests
 
     def step(self):
+        action, self.pending_action = self.pending_action, None
         x, y = self.pos
         possible_steps = self.model.get_neighborhood(x, y)
         new_position = self.pos
@@ -337,21 +664,22 @@ class PredatorAgent:
 
         if self.is_llm_controlled and self.model.io_client and self.model.api_enabled:
             try:
-                action = self.ask_io_for_decision(self.model.prompt_style, self.model.selected_model)
+                if action is None:
+                    action = self.ask_io_for_decision(self.model.prompt_style, self.model.selected_model)
                 self.api_calls += 1
                 if action == "hunt" and possible_steps:
                     target_ant = self._find_nearest_ant()
                     if target_ant:
                         new_position = self._step_toward(self.pos, target_ant.pos)
                     else:
-                        new_position = choice(possible_steps)
+                        new_position = self.model.random_choice(possible_steps)
                 elif action == "patrol" and possible_steps:
                     # Patrol behavior - move to areas with less fear pheromone
                     new_position = self._patrol_behavior(possible_steps)
                 elif action == "rest":
                     new_position = self.pos
                 else:
-                    new_position = choice(possible_steps) if possible_steps else self.pos
+                    new_position = self.model.random_choice(possible_steps) if possible_steps else self.pos
             except Exception as e:
                 # Fallback to rule-based behavior on API error
                 new_position = self._use_rule_based_behavior(possible_steps)
@@ -374,6 +702,9 @@ class PredatorAgent:
     def _step_toward(self, start, target):
         x, y = start
         tx, ty = target
+        if NUMBA_AVAILABLE:
+            nx, ny = step_toward(x, y, tx, ty, self.model.width, self.model.height)
+            return (int(nx), int(ny))
         possible_moves = self.model.get_neighborhood(x, y)
         if not possible_moves:
             return start
@@ -408,92 +739,74 @@ class PredatorAgent:
         if self.hunt_cooldown > 0 or self.energy < 30:
             return
         
-        # Check for ants within hunting range
-        for ant in self.model.ants[:]:  # Use slice to avoid modification during iteration
-            distance = abs(ant.pos[0] - self.pos[0]) + abs(ant.pos[1] - self.pos[1])
-            if distance <= self.hunting_range:
-                # Successful hunt!
-                self.model.ants.remove(ant)
-                self.ants_caught += 1
-                self.energy = min(100, self.energy + 20)  # Gain energy from hunting
-                self.hunt_cooldown = 5  # Cooldown before next hunt
-                self.model.metrics["ants_caught"] += 1
-                
-                # Update ant type specific metrics
-                if ant.is_llm_controlled:
-                    self.model.metrics["llm_ants_caught"] += 1
-                else:
-                    self.model.metrics["rule_ants_caught"] += 1
-                
-                # Deposit strong fear pheromone at hunt location
-                self.model.deposit_pheromone(self.pos, 'fear', self.model.fear_deposit * 3)
-                break  # Only catch one ant per step
+        # Check for ants within hunting range (only one is caught per step)
+        x, y = self.pos
+        in_range = self.model.ants_near(x, y, self.hunting_range, manhattan=True)
+        if not in_range:
+            return
+        ant = in_range[0]
+
+        # Successful hunt!
+        self.model.remove_ant(ant)
+        self.ants_caught += 1
+        self.energy = min(100, self.energy + 20)  # Gain energy from hunting
+        self.hunt_cooldown = 5  # Cooldown before next hunt
+        self.model.metrics["ants_caught"] += 1
+
+        # Update ant type specific metrics
+        if ant.is_llm_controlled:
+            self.model.metrics["llm_ants_caught"] += 1
+        else:
+            self.model.metrics["rule_ants_caught"] += 1
+
+        # Deposit strong fear pheromone at hunt location
+        self.model.deposit_pheromone(self.pos, 'fear', self.model.fear_deposit * 3)
 
     def ask_io_for_decision(self, prompt_style_param, selected_model_param):
         x, y = self.pos
-        nearby_ants = [ant for ant in self.model.ants 
-                      if abs(ant.pos[0] - x) <= 3 and abs(ant.pos[1] - y) <= 3]
+        nearby_ants = self.model.ants_near(x, y, 3)
         
         # Get local pheromone information
         local_pheromones = self.model.get_local_pheromones(self.pos, radius=2)
         
-        pheromone_info = (
-            f"Local Pheromones: "
-            f"Fear: {local_pheromones.get('fear', 0):.2f}, "
-            f"Trail: {local_pheromones.get('trail', 0):.2f}. "
+        # Static instructions live in the cached system prompt; only the state varies
+        system_prompt = self.model._predator_system_prompts.get(
+            prompt_style_param, self.model._predator_system_prompts["Adaptive"]
         )
-
-        if prompt_style_param == "Structured":
-            prompt = (
-                f"You are a predator at position ({x},{y}) on a {self.model.width}x{self.model.height} grid. "
-                f"Nearby ants: {len(nearby_ants)}. Energy: {self.energy}/100. Hunt cooldown: {self.hunt_cooldown}. "
-                f"{pheromone_info}"
-                "Should you 'hunt' ants, 'patrol' territory, or 'rest'? "
-                f"High fear pheromone means you've been here recently. Trail pheromone indicates ant activity. "
-                "Reply with only one word: 'hunt', 'patrol', or 'rest'."
-            )
-        elif prompt_style_param == "Autonomous":
-            prompt = (
-                f"As an autonomous predator, my state is: "
-                f"Position: ({x},{y}), "
-                f"Nearby prey: {len(nearby_ants)} ants, "
-                f"Energy: {self.energy}/100, Hunt cooldown: {self.hunt_cooldown}. "
-                f"{pheromone_info}"
-                "What is the optimal strategy? Choose: 'hunt', 'patrol', or 'rest'. "
-                "Consider energy management and territorial coverage."
-            )
-        else:  # Adaptive
-            success_rate = self.ants_caught / max(1, len(self.move_history))
-            prompt = (
-                f"Predator {self.unique_id} has caught {self.ants_caught} ants with success rate {success_rate:.2f}. "
-                f"Current position: ({x},{y}). "
-                f"Nearby ants: {len(nearby_ants)}. Energy: {self.energy}/100. "
-                f"{pheromone_info}"
-                "Best hunting strategy? Options: 'hunt', 'patrol', 'rest'. "
-                "Adapt based on your success rate and current conditions."
-            )
+        prompt = format_predator_observation(self, nearby_ants, local_pheromones)
 
         try:
             response = self.model.io_client.chat.completions.create(
                 model=selected_model_param,
                 messages=[
-                    {"role": "system", "content": "You are an intelligent predator. Respond with only one word: hunt, patrol, or rest."},
+                    {"role": "system", "content": system_prompt},
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.4,
                 max_completion_tokens=10
             )
-            action = response.choices[0].message.content.strip().lower()
-            return action if action in ["hunt", "patrol", "rest"] else "hunt"
+            action = parse_action(response.choices[0].message.content, PREDATOR_ACTIONS)
+            return action or "hunt"
         except Exception as e:
             return "hunt"  # Default to hunting on error
 
 
 class QueenAnt:
     """Enhanced Queen with pheromone awareness"""
+    __slots__ = ('model', 'use_llm', '_last_food_version', '_last_ant_state', '_last_heuristic',
+                 '_last_guidance', '_last_report', '_llm_cache')
+
     def __init__(self, model, use_llm=False):
         self.model = model
         self.use_llm = use_llm
+        # Last guidance and the ant/food state it was computed for
+        self._last_food_version = None
+        self._last_ant_state = {}
+        self._last_heuristic = False
+        self._last_guidance = {}
+        self._last_report = ""
+        # LLM replies keyed on the quantized state the prompt describes, oldest first
+        self._llm_cache = {}
 
     def guide(self, selected_model_param) -> dict:
         guidance = {}
@@ -501,48 +814,61 @@ class QueenAnt:
             self.model.queen_llm_anomaly_rep = "No food remaining for guidance"
             return guidance
 
-        if self.use_llm and self.model.io_client and self.model.api_enabled:
-            return self._guide_with_llm(selected_model_param)
+        # Guidance depends only on ant and food state; reuse it while that is unchanged
+        ant_state = {ant.unique_id: (ant.pos, ant.carrying_food) for ant in self.model.ants}
+        food_unchanged = self.model.food_version == self._last_food_version
+        if food_unchanged and ant_state == self._last_ant_state:
+            self.model.queen_llm_anomaly_rep = self._last_report
+            return self._last_guidance
+
+        use_heuristic = not (self.use_llm and self.model.io_client and self.model.api_enabled)
+        if use_heuristic and food_unchanged and self._last_heuristic:
+            # Heuristic guidance is per ant, so only ants that moved need new directions
+            changed = [ant for ant in self.model.ants
+                       if self._last_ant_state.get(ant.unique_id) != ant_state[ant.unique_id]]
+            guidance = {uid: step for uid, step in self._last_guidance.items() if uid in ant_state}
+            guidance.update(self._guide_with_heuristic(changed))
+        elif use_heuristic:
+            guidance = self._guide_with_heuristic()
         else:
-            return self._guide_with_heuristic()
+            guidance = self._guide_with_llm(selected_model_param)
+
+        self._last_food_version = self.model.food_version
+        self._last_ant_state = ant_state
+        self._last_heuristic = use_heuristic
+        self._last_guidance = guidance
+        self._last_report = self.model.queen_llm_anomaly_rep
+        return guidance
 
-    def _guide_with_heuristic(self) -> dict:
+    def _guide_with_heuristic(self, ants=None) -> dict:
+        """Guides the given ants (default: all) one step toward food, or home when carrying."""
         guidance = {}
-        ants = self.model.ants
-        foods = list(self.model.foods)
+        all_ants = self.model.ants
+        ants = all_ants if ants is None else ants
         
-        if not foods:
+        if not self.model.foods:
             self.model.queen_llm_anomaly_rep = "No food remaining - no guidance needed"
             return guidance
         
-        # More sophisticated heuristic guidance
-        for ant in ants:
-            if ant.carrying_food:
-                # If ant is carrying food, guide it toward the nest (center)
-                nest_pos = (self.model.width // 2, self.model.height // 2)
-                possible_moves = self.model.get_neighborhood(*ant.pos) + [ant.pos]
-                if possible_moves:
-                    best_step = min(
-                        possible_moves,
-                        key=lambda n: abs(n[0]-nest_pos[0]) + abs(n[1]-nest_pos[1])
-                    )
-                    guidance[ant.unique_id] = best_step
-            else:
-                # If ant is not carrying food, guide it toward nearest food
-                if foods:
-                    target = min(
-                        foods,
-                        key=lambda f: abs(f[0]-ant.pos[0]) + abs(f[1]-ant.pos[1])
-                    )
-                    possible_moves = self.model.get_neighborhood(*ant.pos) + [ant.pos]
-                    if possible_moves:
-                        best_step = min(
-                            possible_moves,
-                            key=lambda n: abs(n[0]-target[0]) + abs(n[1]-target[1])
-                        )
-                        guidance[ant.unique_id] = best_step
+        # More sophisticated heuristic guidance, computed for all ants at once:
+        # carriers head for the nest (center), foragers for their nearest food
+        ants_xy = np.array([ant.pos for ant in ants], dtype=np.int64).reshape(-1, 2)
+        carrying = np.array([ant.carrying_food for ant in ants], dtype=bool)
+        targets = self.model.nearest_foods(ants_xy)
+        targets[carrying] = (self.model.width // 2, self.model.height // 2)
+
+        # Candidate cells: the neighbors in get_neighborhood order, then staying put
+        offsets = np.vstack([self.model._OFFSETS, np.zeros((1, 2), dtype=np.int8)])
+        cand = ants_xy[:, None, :] + offsets[None, :, :]
+        in_bounds = ((cand[..., 0] >= 0) & (cand[..., 0] < self.model.width)
+                     & (cand[..., 1] >= 0) & (cand[..., 1] < self.model.height))
+        dists = np.abs(cand - targets[:, None, :]).sum(2)
+        dists[~in_bounds] = np.iinfo(dists.dtype).max
+        best = cand[np.arange(len(ants)), dists.argmin(1)]
+        guidance = {ant.unique_id: (bx, by) for ant, (bx, by) in zip(ants, best.tolist())}
         
-        self.model.queen_llm_anomaly_rep = f"Queen heuristic guidance: Directed {len(guidance)} ants ({len([a for a in ants if a.carrying_food])} carrying food, {len([a for a in ants if not a.carrying_food])} foraging)"
+        n_carrying = sum(1 for a in all_ants if a.carrying_food)
+        self.model.queen_llm_anomaly_rep = f"Queen heuristic guidance: Directed {len(all_ants)} ants ({n_carrying} carrying food, {len(all_ants) - n_carrying} foraging)"
         return guidance
 
     def _guide_with_llm(self, selected_model_param) -> dict:
@@ -553,53 +879,52 @@ class QueenAnt:
             return self._guide_with_heuristic()
 
         # Summarize global pheromone information for the Queen
-        max_trail_val = np.max(self.model.pheromone_map['trail'])
-        max_alarm_val = np.max(self.model.pheromone_map['alarm'])
-        max_recruitment_val = np.max(self.model.pheromone_map['recruitment'])
-
-        # Find locations of max pheromones
-        trail_locs = np.argwhere(self.model.pheromone_map['trail'] == max_trail_val)
-        alarm_locs = np.argwhere(self.model.pheromone_map['alarm'] == max_alarm_val)
-        recruitment_locs = np.argwhere(self.model.pheromone_map['recruitment'] == max_recruitment_val)
-
-        trail_pos_str = f"({trail_locs[0][0]}, {trail_locs[0][1]})" if trail_locs.size > 0 else "N/A"
-        alarm_pos_str = f"({alarm_locs[0][0]}, {alarm_locs[0][1]})" if alarm_locs.size > 0 else "N/A"
-        recruitment_pos_str = f"({recruitment_locs[0][0]}, {recruitment_locs[0][1]})" if recruitment_locs.size > 0 else "N/A"
-
-        prompt = f"""You are a Queen Ant. Guide your worker ants efficiently.
-
-Current situation:
-- Step: {self.model.step_count}
-- Grid: {self.model.width}x{self.model.height}
-- Ants: {len(self.model.ants)} 
-- Food: {len(self.model.foods)} remaining
-
-Pheromone Summary:
-- Max Trail: {max_trail_val:.2f} at {trail_pos_str} (success paths)
-- Max Alarm: {max_alarm_val:.2f} at {alarm_pos_str} (problems)
-- Max Recruitment: {max_recruitment_val:.2f} at {recruitment_pos_str} (help needed)
-
-Respond with JSON: {{"guidance": {{"0": [x,y], "1": [x,y]}}, "report": "brief status"}}
-
-Ant positions:"""
-        
+        max_trail_val, trail_pos = self.model.pheromone_peak('trail')
+        max_alarm_val, alarm_pos = self.model.pheromone_peak('alarm')
+        max_recruitment_val, recruitment_pos = self.model.pheromone_peak('recruitment')
+
+        # Static instructions live in the cached system prompt; only the state varies
+        lines = [
+            f"step={self.model.step_count} ants={len(self.model.ants)} food={len(self.model.foods)} "
+            f"trail={max_trail_val:.2f}@({trail_pos[0]},{trail_pos[1]}) "
+            f"alarm={max_alarm_val:.2f}@({alarm_pos[0]},{alarm_pos[1]}) "
+            f"recruitment={max_recruitment_val:.2f}@({recruitment_pos[0]},{recruitment_pos[1]})"
+        ]
+        food_grid = self.model.food_grid
+        ant_key = []
         for ant in self.model.ants[:5]:  # Limit to avoid token limits
-            nearby_food = [f for f in self.model.foods if abs(f[0]-ant.pos[0]) <= 2 and abs(f[1]-ant.pos[1]) <= 2]
-            prompt += f"\nAnt {ant.unique_id}: at {ant.pos}, carrying={ant.carrying_food}, nearby_food={len(nearby_food)}"
+            x, y = ant.pos
+            nearby_food = int(food_grid[max(x - 2, 0):x + 3, max(y - 2, 0):y + 3].sum())
+            lines.append(f"Ant {ant.unique_id}: pos=({x},{y}) carrying={ant.carrying_food} nearby_food={nearby_food}")
+            ant_key.append((ant.unique_id, ant.pos, ant.carrying_food, nearby_food))
+        prompt = "\n".join(lines)
+
+        # Quiet steps repeat the same situation; reuse the reply given for it
+        cache_key = (len(self.model.foods) // 5, trail_pos, alarm_pos, recruitment_pos, tuple(ant_key))
+        cached = self._llm_cache.get(cache_key)
+        if cached is not None:
+            cached_guidance, report = cached
+            ants_by_id = {a.unique_id: a for a in self.model.ants}
+            guidance = {ant_id: pos for ant_id, pos in cached_guidance.items()
+                        if ant_id in ants_by_id and ants_by_id[ant_id]._is_reachable(pos)}
+            self.model.queen_llm_anomaly_rep = f"Queen LLM (cached): {report} (guided {len(guidance)} ants)"
+            return guidance
 
         try:
-            response = self.model.io_client.chat.completions.create(
+            # Streamed so we can stop reading as soon as the JSON object is complete
+            stream = self.model.io_client.chat.completions.create(
                 model=selected_model_param,
                 messages=[
-                    {"role": "system", "content": "You are a Queen Ant. Respond only with valid JSON."},
+                    {"role": "system", "content": self.model._queen_system_prompt},
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.1,
                 max_completion_tokens=300,
-                timeout=15
+                timeout=15,
+                stream=True
             )
             
-            response_text = response.choices[0].message.content.strip()
+            response_text = read_json_object_stream(stream).strip()
             
             # Try to extract JSON from response
             try:
@@ -613,20 +938,23 @@ Ant positions:"""
                     report = parsed_response.get("report", "Queen provided guidance")
                     
                     # Validate and convert guidance
+                    ants_by_id = {a.unique_id: a for a in self.model.ants}
                     for ant_id_str, pos in raw_guidance.items():
                         try:
                             ant_id = int(ant_id_str)
                             if isinstance(pos, list) and len(pos) == 2:
-                                ant = next((a for a in self.model.ants if a.unique_id == ant_id), None)
+                                ant = ants_by_id.get(ant_id)
                                 if ant:
                                     proposed_pos = tuple(pos)
-                                    valid_moves = self.model.get_neighborhood(*ant.pos) + [ant.pos]
-                                    if proposed_pos in valid_moves:
+                                    if ant._is_reachable(proposed_pos):
                                         guidance[ant_id] = proposed_pos
                         except (ValueError, TypeError, IndexError):
                             continue
                     
                     self.model.queen_llm_anomaly_rep = f"Queen LLM: {report} (guided {len(guidance)} ants)"
+                    self._llm_cache[cache_key] = (guidance, report)
+                    if len(self._llm_cache) > QUEEN_CACHE_SIZE:
+                        del self._llm_cache[next(iter(self._llm_cache))]
                     return guidance
                 else:
                     raise json.JSONDecodeError("No JSON found", response_text, 0)
@@ -644,23 +972,47 @@ class SimpleForagingModel:
     def __init__(self, width, height, N_ants, N_food,
                  agent_type="LLM-Powered", with_queen=False, use_llm_queen=False,
                  selected_model_param="meta-llama/Llama-3.3-70B-Instruct", prompt_style_param="Adaptive",
-                 N_predators=0, predator_type="LLM-Powered"):
+                 N_predators=0, predator_type="LLM-Powered", seed=None):
         self.width = width
         self.height = height
+
+        # Model-level RNG for ant decisions. Without an explicit seed it is seeded
+        # from np.random, so callers that seed the global RNG stay reproducible.
+        self._rng = np.random.default_rng(seed if seed is not None else np.random.randint(2**31))
+        self._rand_buf = []
+        self._rand_idx = 0
+
+        # Neighborhood offsets (Moore neighborhood, excluding the cell itself).
+        # Neighbor lists are built on demand and the recently used ones cached, so
+        # construction cost and memory do not grow with the grid.
+        self._OFFSETS = np.array([(-1,-1),(-1,0),(-1,1),(0,-1),(0,1),(1,-1),(1,0),(1,1)], dtype=np.int8)
+        self._offset_pairs = [tuple(o) for o in self._OFFSETS.tolist()]
+        self._neighborhood = lru_cache(maxsize=NEIGHBORHOOD_CACHE_SIZE)(self._compute_neighborhood)
         
         # Initialize error logging FIRST
         self.errors = []
         
         # Use set for foods for better performance
-        self.foods = set()
-        while len(self.foods) < N_food:
-            new_food_pos = (np.random.randint(width), np.random.randint(height))
-            self.foods.add(new_food_pos)
+        # Distinct cells drawn in one vectorized call; numpy raises ValueError if
+        # N_food exceeds the number of cells
+        cells = self._rng.choice(width * height, size=N_food, replace=False)
+        self.foods = set(zip(*(axis.tolist() for axis in np.divmod(cells, height))))
+        # Bumped on every pickup/placement so callers can cheaply detect food changes
+        self.food_version = 0
+        # Occupancy grid mirror of self.foods (1 = food), kept in sync on pickup/placement
+        self.food_grid = np.zeros((width, height), dtype=np.uint8)
+        for fx, fy in self.foods:
+            self.food_grid[fx, fy] = 1
+        # NumPy mirror of self.foods for vectorized searches, rebuilt lazily
+        self._foods_xy = None
+        self._nearest_food_idx = None
+        self._foods_dirty = True
 
         self.step_count = 0
         self.metrics = {
             "food_collected": 0,
             "total_api_calls": 0,
+            "cached_decisions": 0,  # LLM decisions answered from the decision cache
             "avg_response_time": 0,
             "food_collected_by_llm": 0,
             "food_collected_by_rule": 0,
@@ -674,14 +1026,39 @@ class SimpleForagingModel:
         self.use_llm_queen = use_llm_queen
         self.selected_model = selected_model_param
         self.prompt_style = prompt_style_param
+        # System prompts depend only on the grid, so they are built once per model
+        self._ant_system_prompts = {
+            style: build_ant_system_prompt(width, height, style) for style in ANT_STYLE_GUIDANCE
+        }
+        self._colony_system_prompt = build_colony_system_prompt(width, height)
+        self._queen_system_prompt = build_queen_system_prompt(width, height)
+        self._predator_system_prompts = {
+            style: build_predator_system_prompt(width, height, style) for style in PREDATOR_STYLE_GUIDANCE
+        }
+
+        # Cache of ant LLM decisions keyed on (prompt_style, food_nearby, carrying, food_left,
+        # bucketed local pheromones), cleared periodically so the model can "re-learn"
+        self._decision_cache = {}
+        # Guards shared state touched by concurrent per-ant LLM calls
+        self._llm_lock = threading.Lock()
+        self.decision_cache_ttl = 10  # steps
 
-        # Pheromone system initialization
+        # Pheromone system initialization: one contiguous stack, exposed per type as views.
+        # Values are capped at max_pheromone_value, so float32 is plenty.
+        self.pheromone_stack = np.zeros((4, width, height), dtype=np.float32)
         self.pheromone_map = {
-            'trail': np.zeros((width, height)),
-            'alarm': np.zeros((width, height)),
-            'recruitment': np.zeros((width, height)),
-            'fear': np.zeros((width, height)) # Added fear pheromone
+            'trail': self.pheromone_stack[0],
+            'alarm': self.pheromone_stack[1],
+            'recruitment': self.pheromone_stack[2],
+            'fear': self.pheromone_stack[3] # Added fear pheromone
         }
+        self._PHEROMONE_INDEX = {'trail': 0, 'alarm': 1, 'recruitment': 2, 'fear': 3}
+        # Zero-padded summed-area table of pheromone_stack, rebuilt lazily after changes
+        # (kept in float64 so corner differences of large sums stay accurate)
+        self._pheromone_integral = np.zeros((4, width + 1, height + 1))
+        self._pheromone_dirty = True
+        # (type index, x, y, amount) deposits queued during the ant loop, else None
+        self._deposit_buffer = None
         self.pheromone_decay_rate = 0.05  # 5% decay per step
         self.trail_deposit = 1.0
         self.alarm_deposit = 2.0
@@ -690,7 +1067,7 @@ class SimpleForagingModel:
         self.fear_deposit = 3.0 # Fear pheromone deposit amount
 
         # Foraging efficiency grid
-        self.foraging_efficiency_grid = np.zeros((width, height))
+        self.foraging_efficiency_grid = np.zeros((width, height), dtype=np.float32)
         self.foraging_decay_rate = 0.98  # 98% retention per step
         self.food_collection_score_boost = 10.0
         self.traverse_score_boost = 0.1
@@ -705,6 +1082,10 @@ class SimpleForagingModel:
         self.blockchain_transactions = []  # Structured transaction data
         self.enable_blockchain = True  # Always enabled
         self.food_collection_count = 0  # Debug counter
+        # Sender and receipt pools, started on the first pickup, see collect_food
+        self._blockchain_executor = None
+        self._receipt_executor = None
+        self._blockchain_error_count = 0
         
         # Add test blockchain log
         test_tx = f"0x{hash('test_init') % (2**64):016x}"
@@ -715,10 +1096,7 @@ class SimpleForagingModel:
         self.api_enabled = False
         if IO_API_KEY:
             try:
-                self.io_client = openai.OpenAI(
-                    api_key=IO_API_KEY,
-                    base_url="https://api.intelligence.io.solutions/api/v1/"
-                )
+                self.io_client = get_io_client()
                 self.api_enabled = True
                 self.log_error("LLM API initialized successfully.")
             except Exception as e:
@@ -730,26 +1108,31 @@ class SimpleForagingModel:
 
         # Create agents based on type
         self.ants = []
+        ant_positions = self.random_positions(N_ants)
         if agent_type == "LLM-Powered":
-            self.ants = [SimpleAntAgent(i, self, True) for i in range(N_ants)]
+            self.ants = [SimpleAntAgent(i, self, True, ant_positions[i]) for i in range(N_ants)]
         elif agent_type == "Rule-Based":
-            self.ants = [SimpleAntAgent(i, self, False) for i in range(N_ants)]
+            self.ants = [SimpleAntAgent(i, self, False, ant_positions[i]) for i in range(N_ants)]
         else:  # Hybrid
             for i in range(N_ants):
                 is_llm = i < N_ants // 2
-                self.ants.append(SimpleAntAgent(i, self, is_llm))
+                self.ants.append(SimpleAntAgent(i, self, is_llm, ant_positions[i]))
+        self._sync_ant_arrays()
+        # Ants bucketed by cell for the predators' local lookups, rebuilt each step
+        self._ant_cells = {}
 
         # Create predators based on type
         self.predators = []
         if N_predators > 0:
+            predator_positions = self.random_positions(N_predators)
             if predator_type == "LLM-Powered":
-                self.predators = [PredatorAgent(i + 1000, self, True) for i in range(N_predators)]
+                self.predators = [PredatorAgent(i + 1000, self, True, predator_positions[i]) for i in range(N_predators)]
             elif predator_type == "Rule-Based":
-                self.predators = [PredatorAgent(i + 1000, self, False) for i in range(N_predators)]
+                self.predators = [PredatorAgent(i + 1000, self, False, predator_positions[i]) for i in range(N_predators)]
             else:  # Hybrid
                 for i in range(N_predators):
                     is_llm = i < N_predators // 2
-                    self.predators.append(PredatorAgent(i + 1000, self, is_llm))
+                    self.predators.append(PredatorAgent(i + 1000, self, is_llm, predator_positions[i]))
 
         self.queen = QueenAnt(self, use_llm=self.use_llm_queen) if self.with_queen else None
         # Queen initialization completed
@@ -763,6 +1146,11 @@ class SimpleForagingModel:
     def step(self):
         self.step_count += 1
         guidance = {}
+        # Pre-draw this step's random numbers (about two per ant)
+        self._refill_random_buffer(len(self.ants) * 2)
+
+        if self.step_count % self.decision_cache_ttl == 0:
+            self._decision_cache.clear()
         
         if self.queen:
             try:
@@ -772,18 +1160,45 @@ class SimpleForagingModel:
                 self.log_error(f"Queen guidance failed: {str(e)}")
                 guidance = {}
 
+        if self.io_client and self.api_enabled:
+            # One request for every LLM ant that will need a decision this step; ants
+            # on food pick it up and ants with a predator within 2 cells flee instead
+            predator_cells = [p.pos for p in self.predators]
+            llm_ants = [
+                ant for ant in self.ants
+                if ant.is_llm_controlled and ant.unique_id not in guidance
+                and not (self.is_food_at(ant.pos) and not ant.carrying_food)
+                and not any(abs(px - ant.pos[0]) <= 2 and abs(py - ant.pos[1]) <= 2 for px, py in predator_cells)
+            ]
+            # Worker threads read the pheromone table, so build it up front and
+            # queue their (error path) alarm deposits until they are all done
+            self._refresh_pheromone_integral()
+            self._deposit_buffer = []
+            try:
+                self._batch_llm_decisions(llm_ants)
+                self._parallel_llm_decisions(llm_ants)
+            finally:
+                self._flush_deposits()
+
         self.metrics["ants_carrying_food"] = 0
         food_collected_this_step = 0
-        for ant in self.ants:
-            guided_pos = guidance.get(ant.unique_id)
-            ant.step(guided_pos)
-            if ant.carrying_food:
-                self.metrics["ants_carrying_food"] += 1
-            if ant.is_llm_controlled:
-                self.metrics["total_api_calls"] += ant.api_calls
-                ant.api_calls = 0
-
-        # Step predators
+        # Ant deposits are queued and applied together once every ant has moved
+        self._deposit_buffer = []
+        try:
+            for ant in self.ants:
+                guided_pos = guidance.get(ant.unique_id)
+                ant.step(guided_pos)
+                if ant.carrying_food:
+                    self.metrics["ants_carrying_food"] += 1
+        finally:
+            self._flush_deposits()
+
+        # Step predators (ants stay put meanwhile, so one bucketing serves them all)
+        if self.predators:
+            self._index_ant_cells()
+            if self.io_client and self.api_enabled:
+                self._refresh_pheromone_integral()
+                self._parallel_predator_decisions()
         for predator in self.predators:
             predator.step()
             if predator.is_llm_controlled:
@@ -795,47 +1210,217 @@ class SimpleForagingModel:
         self.foraging_efficiency_grid *= self.foraging_decay_rate
         self.foraging_efficiency_grid[self.foraging_efficiency_grid < 0.01] = 0
 
-        # Add score for LLM ant traversals
-        for ant in self.ants:
-            if ant.is_llm_controlled:
-                x, y = ant.pos
-                if 0 <= x < self.width and 0 <= y < self.height:
-                    self.foraging_efficiency_grid[x, y] += self.traverse_score_boost
+        # Add score for LLM ant traversals (positions are always on the grid)
+        self._sync_ant_arrays()
+        llm = self.ant_is_llm
+        np.add.at(self.foraging_efficiency_grid, (self.ant_x[llm], self.ant_y[llm]), self.traverse_score_boost)
 
-        # Apply pheromone evaporation
-        for p_type in self.pheromone_map:
-            self.pheromone_map[p_type] *= (1 - self.pheromone_decay_rate)
-            self.pheromone_map[p_type] = np.clip(self.pheromone_map[p_type], 0, self.max_pheromone_value)
+        # Apply pheromone evaporation in place over all types at once. No clipping is
+        # needed: deposits cap values at max_pheromone_value and decay only lowers them.
+        np.multiply(self.pheromone_stack, 1 - self.pheromone_decay_rate, out=self.pheromone_stack)
+        self._pheromone_dirty = True
 
         # Track food depletion
         food_piles_remaining = len(self.foods)
-        self.food_depletion_history.append({
-            "step": self.step_count,
-            "food_piles_remaining": food_piles_remaining
-        })
+        self.food_depletion_history.append(FoodDepletionPoint(
+            step=self.step_count,
+            food_piles_remaining=food_piles_remaining
+        ))
 
         # Debug output for blockchain
         if self.step_count % 5 == 0:  # Every 5 steps
             pass  # Step completed
 
+    def _sync_ant_arrays(self):
+        """Refreshes the column arrays (ant_x, ant_y, ant_is_llm) from the ant objects.
+
+        The agents stay the source of truth; these arrays are a per-step snapshot
+        for vectorized updates over the whole colony.
+        """
+        ants = self.ants
+        n = len(ants)
+        xy = np.fromiter((c for ant in ants for c in ant.pos), dtype=np.int32, count=2 * n).reshape(n, 2)
+        self.ant_x, self.ant_y = xy[:, 0], xy[:, 1]
+        self.ant_is_llm = np.fromiter((ant.is_llm_controlled for ant in ants), dtype=bool, count=n)
+
+    def _refill_random_buffer(self, n):
+        self._rand_buf = self._rng.random(max(n, 16)).tolist()
+        self._rand_idx = 0
+
+    def random(self):
+        """Returns the next uniform [0, 1) draw from the pre-drawn buffer."""
+        if self._rand_idx == len(self._rand_buf):
+            self._refill_random_buffer(len(self._rand_buf))
+        value = self._rand_buf[self._rand_idx]
+        self._rand_idx += 1
+        return value
+
+    def random_positions(self, n):
+        """Draws n uniformly random grid cells as (x, y) tuples in one vectorized call."""
+        xs = self._rng.integers(0, self.width, size=n)
+        ys = self._rng.integers(0, self.height, size=n)
+        return list(zip(xs.tolist(), ys.tolist()))
+
+    def random_choice(self, options):
+        """Picks a random element of a non-empty sequence using the model RNG."""
+        return options[int(self.random() * len(options))]
+
+    def _batch_llm_decisions(self, ants):
+        """Asks the LLM for every ant's action, LLM_BATCH_SIZE ants per request.
+
+        Ants whose situation is already in the decision cache reuse its action;
+        the rest are asked in chunk requests that run concurrently. Actions are
+        stored in ``ant.pending_action``; ants left without one (e.g. when their
+        chunk's request fails) fall back to an individual call.
+        """
+        entries = []
+        for ant in ants:
+            observation = ant._observe()
+            key = ant._decision_key(self.prompt_style, self.selected_model, *observation)
+            cached_action = self._decision_cache.get(key)
+            if cached_action is not None:
+                ant.pending_action = cached_action
+                self.metrics["cached_decisions"] += 1
+            else:
+                entries.append((ant, observation, key))
+        if not entries:
+            return
+
+        chunks = [entries[i:i + LLM_BATCH_SIZE] for i in range(0, len(entries), LLM_BATCH_SIZE)]
+        if len(chunks) == 1:
+            self._batched_decide(chunks[0])
+            return
+        list(get_llm_executor().map(self._batched_decide, chunks))
+
+    def _batched_decide(self, entries):
+        """Asks the LLM for the actions of a chunk of (ant, observation, cache key) in one request."""
+        lines = [
+            f"Ant {ant.unique_id}: " + format_ant_observation(ant, *observation)
+            for ant, observation, _ in entries
+        ]
+        prompt = "\n".join(lines)
+
+        try:
+            with self._llm_lock:
+                self.metrics["total_api_calls"] += 1
+            reply = chat_completion(self.selected_model, self._colony_system_prompt, prompt,
+                                    io_client=self.io_client, max_tokens=20 + 12 * len(entries), timeout=15)
+            if not reply or '{' not in reply or '}' not in reply:
+                raise ValueError("No JSON found in batched response")
+            actions = json.loads(reply[reply.find('{'):reply.rfind('}') + 1])
+            if not isinstance(actions, dict):
+                raise ValueError("Batched response is not a JSON object")
+        except Exception as e:
+            self.log_error(f"Batched LLM decision failed: {str(e)}. Ants will decide individually.")
+            return
+
+        # Ants missing from the reply, or with an unknown action, keep None and are asked individually
+        for ant, _, key in entries:
+            action = parse_action(actions.get(str(ant.unique_id)), ANT_ACTIONS)
+            ant.pending_action = action
+            if action:
+                self._decision_cache[key] = action
+
+    def _parallel_llm_decisions(self, ants):
+        """Asks the LLM individually, and concurrently, for ants the batch left undecided.
+
+        The requests are I/O bound, so a thread pool overlaps their round trips
+        instead of making each ant wait for the previous one during its step.
+        """
+        pending = [ant for ant in ants if ant.pending_action is None]
+        if not pending:
+            return
+
+        # Ants in the same situation would send identical prompts; ask once per situation
+        groups = {}
+        for ant in pending:
+            key = ant._decision_key(self.prompt_style, self.selected_model, *ant._observe())
+            groups.setdefault(key, []).append(ant)
+        groups = list(groups.values())
+
+        actions = list(get_llm_executor().map(
+            lambda group: group[0].ask_io_for_decision(self.prompt_style, self.selected_model), groups
+        ))
+        for group, action in zip(groups, actions):
+            for ant in group:
+                ant.pending_action = action
+            self.metrics["cached_decisions"] += len(group) - 1
+
+    def _parallel_predator_decisions(self):
+        """Asks the LLM for every LLM predator's action concurrently, before any predator moves.
+
+        Like the ants' batched decisions, each predator decides from the state at
+        the start of the predator phase rather than after the predators before it.
+        """
+        predators = [p for p in self.predators if p.is_llm_controlled]
+        if len(predators) < 2:
+            return
+
+        actions = list(get_llm_executor().map(
+            lambda predator: predator.ask_io_for_decision(self.prompt_style, self.selected_model), predators
+        ))
+        for predator, action in zip(predators, actions):
+            predator.pending_action = action
+
+    def _index_ant_cells(self):
+        """Buckets (list index, ant) pairs by position for ants_near."""
+        cells = {}
+        for i, ant in enumerate(self.ants):
+            cells.setdefault(ant.pos, []).append((i, ant))
+        self._ant_cells = cells
+
+    def ants_near(self, x, y, radius, manhattan=False):
+        """Returns the ants within radius of (x, y), in self.ants order.
+
+        The square (or, with manhattan=True, diamond) around the cell is read from
+        the per-step buckets instead of scanning every ant.
+        """
+        cells = self._ant_cells
+        found = []
+        for dx in range(-radius, radius + 1):
+            span = radius - abs(dx) if manhattan else radius
+            for dy in range(-span, span + 1):
+                bucket = cells.get((x + dx, y + dy))
+                if bucket:
+                    found.extend(bucket)
+        found.sort(key=lambda entry: entry[0])
+        return [ant for _, ant in found]
+
+    def remove_ant(self, ant):
+        """Removes a caught ant from the colony and from the cell buckets."""
+        self.ants.remove(ant)
+        bucket = self._ant_cells.get(ant.pos)
+        if bucket:
+            bucket[:] = [entry for entry in bucket if entry[1] is not ant]
+
+    def _compute_neighborhood(self, x, y):
+        width, height = self.width, self.height
+        return [(x + dx, y + dy) for dx, dy in self._offset_pairs
+                if 0 <= x + dx < width and 0 <= y + dy < height]
+
     def get_neighborhood(self, x, y):
-        neigh = [(x+dx, y+dy)
-                 for dx in (-1,0,1)
-                 for dy in (-1,0,1)
-                 if (dx,dy)!=(0,0)]
-        valid_neigh = []
-        for i,j in neigh:
-            if 0 <= i < self.width and 0 <= j < self.height:
-                valid_neigh.append((i,j))
-        return valid_neigh
+        """Returns the in-bounds neighbors of (x, y). The list is shared; do not mutate it."""
+        return self._neighborhood(x, y)
 
     def is_food_at(self, pos):
         return pos in self.foods
 
+    def food_within_radius(self, x, y, r=1):
+        """True if any food lies within Chebyshev distance r of (x, y); checks cells, not the food list."""
+        foods = self.foods
+        for dx in range(-r, r + 1):
+            for dy in range(-r, r + 1):
+                if (x + dx, y + dy) in foods:
+                    return True
+        return False
+
     def collect_food(self, pos, is_llm_controlled_ant):
         """Enhanced food collection with efficiency tracking and blockchain logging"""
         if pos in self.foods:
             self.foods.discard(pos)
+            self.food_grid[pos[0], pos[1]] = 0
+            self.food_version += 1
+            self._foods_dirty = True
             self.metrics["food_collected"] += 1
             self.food_collection_count += 1  # Debug counter
 
@@ -850,112 +1435,149 @@ class SimpleForagingModel:
                 if is_llm_controlled_ant:
                     self.foraging_efficiency_grid[x, y] += self.food_collection_score_boost
 
-            # Collecting food at position
-
             # --- Blockchain Integration: Record food collection on-chain ---
-            try:
-                import time
-                submit_time = time.time() * 1000  # milliseconds
-                tx_hash = None
-                latency_ms = 0
-                success = False
-                gas_used = 0
-                
-                # Try to submit real blockchain transaction
-                try:
-                    from blockchain.client import w3, acct, memory_contract, MEMORY_CONTRACT_ADDRESS
-                    
-                    # Detailed debugging
-                    # Blockchain connection verified
-                    
-                    if not memory_contract:
-                        raise Exception("memory_contract is None - contract not initialized")
-                    if not MEMORY_CONTRACT_ADDRESS:
-                        raise Exception("MEMORY_CONTRACT_ADDRESS is None - check .env file")
-                    if not w3.is_connected():
-                        raise Exception("Web3 not connected to RPC")
-                    
-                    # All checks passed, submit real transaction
-                    food_id = self.food_collection_count
-                    x_coord, y_coord = pos
-                    
-                    # Submitting blockchain transaction
-                    
-                    # Get nonce - use 'pending' to include pending transactions
-                    nonce = w3.eth.get_transaction_count(acct.address, 'pending')
-                    
-                    # Get current gas price and add 10% buffer to avoid underpricing
-                    base_gas_price = w3.eth.gas_price
-                    gas_price = int(base_gas_price * 1.1)
-                    
-                    tx = memory_contract.functions.recordFood(
-                        food_id, x_coord, y_coord
-                    ).build_transaction({
-                        'from': acct.address,
-                        'nonce': nonce,
-                        'gas': 100000,  # Estimated gas limit
-                        'gasPrice': gas_price,
-                        'chainId': w3.eth.chain_id
-                    })
-                    
-                    # Sign and send transaction
-                    signed_tx = acct.sign_transaction(tx)
-                    # Use raw_transaction (snake_case) for newer web3.py versions
-                    raw_tx = signed_tx.raw_transaction if hasattr(signed_tx, 'raw_transaction') else signed_tx.rawTransaction
-                    tx_hash_bytes = w3.eth.send_raw_transaction(raw_tx)
-                    tx_hash = tx_hash_bytes.hex()
-                    if not tx_hash.startswith('0x'):
-                        tx_hash = '0x' + tx_hash
-                    
-                    # Wait for confirmation with extended timeout
-                    receipt = w3.eth.wait_for_transaction_receipt(tx_hash_bytes, timeout=60)
-                    confirm_time = time.time() * 1000
-                    latency_ms = int(confirm_time - submit_time)
-                    success = receipt['status'] == 1
-                    gas_used = receipt['gasUsed']
-                    
-                    # Add delay between transactions to prevent nonce conflicts
-                    time.sleep(1.5)
-                    
-                except Exception as blockchain_error:
-                    # Fall back to simulated transaction
-                    print(f"[BLOCKCHAIN] ⚠️ Real blockchain unavailable: {blockchain_error}")
-                    print(f"[BLOCKCHAIN] Error type: {type(blockchain_error).__name__}")
-                    import traceback
-                    print(f"[BLOCKCHAIN] Traceback: {traceback.format_exc()}")
-                    print("[BLOCKCHAIN] ⚠️ Using simulated transaction as fallback")
-                    tx_hash = f"0x{hash(f'{pos}_{self.step_count}_{time.time()}') % (16**64):064x}"
-                    latency_ms = np.random.randint(50, 200)
-                    confirm_time = submit_time + latency_ms
-                    success = True
-                
-                # Store structured transaction data
-                tx_data = {
-                    'tx_hash': tx_hash,
-                    'step': self.step_count,
-                    'position': list(pos),
-                    'ant_type': 'LLM' if is_llm_controlled_ant else 'Rule',
-                    'submit_time': submit_time,
-                    'confirm_time': submit_time + latency_ms,
-                    'latency_ms': latency_ms,
-                    'success': success,
-                    'gas_used': gas_used
-                }
-                self.blockchain_transactions.append(tx_data)
+            # Confirmation takes seconds, so a single background worker records
+            # pickups in order while the simulation keeps stepping
+            if self._blockchain_executor is None:
+                self._blockchain_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="blockchain")
+                self._receipt_executor = ThreadPoolExecutor(
+                    max_workers=BLOCKCHAIN_RECEIPT_WORKERS, thread_name_prefix="blockchain-receipt"
+                )
+            self._blockchain_executor.submit(
+                self._record_food_on_chain, self.food_collection_count, pos, self.step_count, is_llm_controlled_ant
+            )
+
+    def _record_food_on_chain(self, food_id, pos, step, is_llm_controlled_ant):
+        """Sends one food pickup's transaction, or records a simulated one if the chain is unavailable.
+
+        Nonces are assigned locally, so the next pickup can be sent without waiting
+        for this one to be mined; its receipt is awaited on the receipt pool.
+        """
+        record = (pos, step, is_llm_controlled_ant)
+        submit_time = time.time() * 1000  # milliseconds
+        try:
+            client, client_error = _load_blockchain_client()
+            if client is None:
+                raise RuntimeError(f"blockchain client unavailable ({type(client_error).__name__}: {client_error})")
+            w3, acct = client.w3, client.acct
+            memory_contract, MEMORY_CONTRACT_ADDRESS = client.memory_contract, client.MEMORY_CONTRACT_ADDRESS
+
+            if not memory_contract:
+                raise Exception("memory_contract is None - contract not initialized")
+            if not MEMORY_CONTRACT_ADDRESS:
+                raise Exception("MEMORY_CONTRACT_ADDRESS is None - check .env file")
+            if not w3.is_connected():
+                raise Exception("Web3 not connected to RPC")
+            
+            # All checks passed, submit real transaction
+            x_coord, y_coord = pos
+            
+            # Chain id, nonce and gas price come from the local cache
+            chain_id, nonce, gas_price = next_tx_params(w3, acct.address)
+            
+            tx = memory_contract.functions.recordFood(
+                food_id, x_coord, y_coord
+            ).build_transaction({
+                'from': acct.address,
+                'nonce': nonce,
+                'gas': 100000,  # Estimated gas limit
+                'gasPrice': gas_price,
+                'chainId': chain_id
+            })
+            
+            # Sign and send transaction
+            signed_tx = acct.sign_transaction(tx)
+            # Use raw_transaction (snake_case) for newer web3.py versions
+            raw_tx = signed_tx.raw_transaction if hasattr(signed_tx, 'raw_transaction') else signed_tx.rawTransaction
+            tx_hash_bytes = w3.eth.send_raw_transaction(raw_tx)
+        except Exception as blockchain_error:
+            self._record_simulated_food_tx(blockchain_error, submit_time, *record)
+            return
+
+        self._receipt_executor.submit(self._confirm_food_tx, w3, tx_hash_bytes, submit_time, *record)
+
+    def _confirm_food_tx(self, w3, tx_hash_bytes, submit_time, pos, step, is_llm_controlled_ant):
+        """Waits for a sent food transaction to be mined and records the outcome."""
+        tx_hash = tx_hash_bytes.hex()
+        if not tx_hash.startswith('0x'):
+            tx_hash = '0x' + tx_hash
+        try:
+            # Wait for confirmation with extended timeout
+            receipt = w3.eth.wait_for_transaction_receipt(tx_hash_bytes, timeout=60)
+        except Exception as blockchain_error:
+            self._record_simulated_food_tx(blockchain_error, submit_time, pos, step, is_llm_controlled_ant)
+            return
+        latency_ms = int(time.time() * 1000 - submit_time)
+        self._store_food_tx(tx_hash, submit_time, latency_ms, receipt['status'] == 1, receipt['gasUsed'],
+                            pos, step, is_llm_controlled_ant)
+
+    def _record_simulated_food_tx(self, blockchain_error, submit_time, pos, step, is_llm_controlled_ant):
+        """Falls back to a simulated transaction after a blockchain failure."""
+        # The local nonce may be out of step with the chain now
+        reset_tx_nonce()
+        # The chain is usually down for the whole run, so only the first and
+        # every Nth failure are logged (the count only throttles logging)
+        self._blockchain_error_count += 1
+        if self._blockchain_error_count % BLOCKCHAIN_ERROR_LOG_EVERY == 1:
+            print(f"[BLOCKCHAIN] ⚠️ Real blockchain unavailable (failure #{self._blockchain_error_count}): "
+                  f"{type(blockchain_error).__name__}: {blockchain_error}. Using simulated transaction as fallback")
+        tx_hash = "0x" + secrets.token_hex(32)
+        latency_ms = random.randint(50, 199)
+        self._store_food_tx(tx_hash, submit_time, latency_ms, True, 0, pos, step, is_llm_controlled_ant)
+
+    def _store_food_tx(self, tx_hash, submit_time, latency_ms, success, gas_used, pos, step, is_llm_controlled_ant):
+        """Appends a food pickup's transaction to blockchain_transactions and blockchain_logs."""
+        try:
+            # Store structured transaction data
+            tx_data = BlockchainTransaction(
+                tx_hash=tx_hash,
+                step=step,
+                position=list(pos),
+                ant_type='LLM' if is_llm_controlled_ant else 'Rule',
+                submit_time=submit_time,
+                confirm_time=submit_time + latency_ms,
+                latency_ms=latency_ms,
+                success=success,
+                gas_used=gas_used
+            )
+            self.blockchain_transactions.append(tx_data)
+            
+            log_message = f"Food collected at position {pos} by {'LLM' if is_llm_controlled_ant else 'Rule'}-based ant. Tx: {tx_hash} (latency: {latency_ms}ms)"
+            self.blockchain_logs.append(log_message)
+            print(f"[BLOCKCHAIN] {log_message}")
                 
-                log_message = f"Food collected at position {pos} by {'LLM' if is_llm_controlled_ant else 'Rule'}-based ant. Tx: {tx_hash} (latency: {latency_ms}ms)"
-                self.blockchain_logs.append(log_message)
-                print(f"[BLOCKCHAIN] {log_message}")
-                    
-            except Exception as b_e:
-                error_msg = f"Blockchain log failed for food collection at {pos}: {b_e}"
-                self.blockchain_logs.append(error_msg)
-                print(f"[BLOCKCHAIN ERROR] {error_msg}")
-                # Don't let blockchain errors break the simulation
+        except Exception as b_e:
+            error_msg = f"Blockchain log failed for food collection at {pos}: {b_e}"
+            self.blockchain_logs.append(error_msg)
+            print(f"[BLOCKCHAIN ERROR] {error_msg}")
+            # Don't let blockchain errors break the simulation
+
+    def flush_blockchain(self):
+        """Waits for queued blockchain records, so the logs and transactions are complete."""
+        if self._blockchain_executor is None:
+            return
+        # Every send has been queued for confirmation once the sender is done
+        self._blockchain_executor.shutdown(wait=True)
+        self._receipt_executor.shutdown(wait=True)
+        self._blockchain_executor = self._receipt_executor = None
+        # Confirmations finish out of order; list transactions in pickup order
+        self.blockchain_transactions.sort(key=lambda tx: tx.step)
 
     def place_food(self, pos):
         if pos not in self.foods:
             self.foods.add(pos)
+            self.food_grid[pos[0], pos[1]] = 1
+            self.food_version += 1
+            self._foods_dirty = True
+
+    def nearest_foods(self, xy):
+        """Vectorized nearest_food: returns an (n, 2) array of the closest food for each row of xy."""
+        nearest = self.get_nearest_food_map()
+        if nearest is not None:
+            return nearest[:, xy[:, 0], xy[:, 1]].T.astype(np.int64)
+        foods_xy = self.get_food_array()
+        dists = np.abs(xy[:, None, :] - foods_xy[None, :, :]).sum(2)
+        return foods_xy[dists.argmin(1)]
 
     def get_agent_positions(self):
         return [ant.pos for ant in self.ants]
@@ -963,39 +1585,100 @@ class SimpleForagingModel:
     def get_food_positions(self):
         return list(self.foods)
 
-    def deposit_pheromone(self, pos, p_type, amount):
-        """Deposits pheromone at a given position"""
-        if 0 <= pos[0] < self.width and 0 <= pos[1] < self.height:
-            self.pheromone_map[p_type][pos[0], pos[1]] += amount
-            self.pheromone_map[p_type][pos[0], pos[1]] = min(
-                self.pheromone_map[p_type][pos[0], pos[1]], 
-                self.max_pheromone_value
+    def get_food_array(self):
+        """Returns food positions as an (n_food, 2) int array, in set iteration order."""
+        if self._foods_dirty:
+            self._foods_xy = np.array(list(self.foods), dtype=np.int64).reshape(-1, 2)
+            self._nearest_food_idx = None
+            self._foods_dirty = False
+        return self._foods_xy
+
+    def get_nearest_food_map(self):
+        """Returns a (2, width, height) array of each cell's nearest food coordinates.
+
+        Built with a taxicab distance transform the first time it is needed after
+        the food changes. None without scipy or when no food is left.
+        """
+        foods_xy = self.get_food_array()
+        if ndimage is None or not len(foods_xy):
+            return None
+        if self._nearest_food_idx is None:
+            food_free = self.food_grid == 0
+            self._nearest_food_idx = ndimage.distance_transform_cdt(
+                food_free, metric='taxicab', return_distances=False, return_indices=True
             )
+        return self._nearest_food_idx
+
+    def nearest_food(self, pos):
+        """Returns the food position closest to pos by Manhattan distance, or None."""
+        if not self.foods:
+            return None
+        nearest = self.get_nearest_food_map()
+        if nearest is not None:
+            x, y = pos
+            return (int(nearest[0, x, y]), int(nearest[1, x, y]))
+        foods_xy = self.get_food_array()
+        dists = np.abs(foods_xy - pos).sum(1)
+        return tuple(foods_xy[dists.argmin()].tolist())
+
+    def deposit_pheromone(self, pos, p_type, amount):
+        """Deposits pheromone at a given position (an agent's own, always on the grid)"""
+        x, y = pos
+        if self._deposit_buffer is not None:
+            self._deposit_buffer.append((self._PHEROMONE_INDEX[p_type], x, y, amount))
+            return
+        arr = self.pheromone_map[p_type]
+        value = arr[x, y] + amount
+        arr[x, y] = value if value < self.max_pheromone_value else self.max_pheromone_value
+        self._pheromone_dirty = True
+
+    def _flush_deposits(self):
+        """Applies all queued deposits with one scatter-add, then caps at the max value."""
+        buffer, self._deposit_buffer = self._deposit_buffer, None
+        if not buffer:
+            return
+        types, xs, ys, amounts = zip(*buffer)
+        np.add.at(self.pheromone_stack, (types, xs, ys), amounts)
+        # Deposits are positive, so capping the sum equals capping after each deposit
+        np.minimum(self.pheromone_stack, self.max_pheromone_value, out=self.pheromone_stack)
+        self._pheromone_dirty = True
+
+    def pheromone_peak(self, p_type):
+        """Returns (max value, (x, y) of its first occurrence) for a pheromone type in one pass."""
+        arr = self.pheromone_map[p_type]
+        flat = int(arr.argmax())
+        return float(arr.flat[flat]), divmod(flat, self.height)
+
+    def _refresh_pheromone_integral(self):
+        """Rebuilds the summed-area table if the pheromones changed since it was built.
+
+        The rebuild writes the shared table in place, so it must only run on the
+        stepping thread; step() calls it before fanning out LLM requests, whose
+        workers then only read the table.
+        """
+        if self._pheromone_dirty:
+            np.cumsum(self.pheromone_stack, axis=1, out=self._pheromone_integral[:, 1:, 1:])
+            np.cumsum(self._pheromone_integral[:, 1:, 1:], axis=2, out=self._pheromone_integral[:, 1:, 1:])
+            self._pheromone_dirty = False
 
     def get_local_pheromones(self, pos, radius):
         """Returns local pheromone levels around a position"""
+        self._refresh_pheromone_integral()
+
+        # Window clamped to the grid, as padded-table indices
         x, y = pos
-        local_trail = 0.0
-        local_alarm = 0.0
-        local_recruitment = 0.0
-        local_fear = 0.0 # Added fear pheromone
+        x1, x2 = max(x - radius, 0), min(x + radius + 1, self.width)
+        y1, y2 = max(y - radius, 0), min(y + radius + 1, self.height)
+        S = self._pheromone_integral
+        local = (S[:, x2, y2] - S[:, x1, y2] - S[:, x2, y1] + S[:, x1, y1]).tolist()
 
-        for dx in range(-radius, radius + 1):
-            for dy in range(-radius, radius + 1):
-                nx, ny = x + dx, y + dy
-                if 0 <= nx < self.width and 0 <= ny < self.height:
-                    local_trail += self.pheromone_map['trail'][nx, ny]
-                    local_alarm += self.pheromone_map['alarm'][nx, ny]
-                    local_recruitment += self.pheromone_map['recruitment'][nx, ny]
-                    local_fear += self.pheromone_map['fear'][nx, ny] # Added fear pheromone
-        
         # Normalize by area
         area = (2 * radius + 1)**2
         return {
-            'trail': local_trail / area,
-            'alarm': local_alarm / area,
-            'recruitment': local_recruitment / area,
-            'fear': local_fear / area # Added fear pheromone
+            'trail': local[0] / area,
+            'alarm': local[1] / area,
+            'recruitment': local[2] / area,
+            'fear': local[3] / area # Added fear pheromone
         }
 
     def set_pheromone_params(self, decay_rate, trail_deposit=None, alarm_deposit=None, recruitment_deposit=None, max_value=None, fear_deposit=None):
@@ -1012,6 +1695,9 @@ class SimpleForagingModel:
         self.fear_deposit = 2.0
         # Max value based on number of ants
         self.max_pheromone_value = len(self.ants) * 2.0
+        # Keep the 0 <= value <= max invariant that evaporation relies on
+        np.minimum(self.pheromone_stack, self.max_pheromone_value, out=self.pheromone_stack)
+        self._pheromone_dirty = True
 
     def log_error(self, message: str):
         """Log a non-fatal error during the simulation."""
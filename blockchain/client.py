@@ -3,6 +3,8 @@ from dotenv import load_dotenv
 from web3 import Web3
 from eth_account import Account
 import json
+import requests
+from requests.adapters import HTTPAdapter
 
 # Load environment variables from .env file
 load_dotenv()
@@ -46,7 +48,14 @@ if not _PRIV_KEY:
     raise ValueError("PRIVATE_KEY environment variable not set or is empty. Please set it in your .env file with a valid testnet private key.")
 
 # Initialize Web3 provider
-w3 = Web3(Web3.HTTPProvider(RPC_URL))
+# One keep-alive session for every RPC; each running simulation waits on up to
+# BLOCKCHAIN_RECEIPT_WORKERS (backend/simulation.py) receipts at once, so
+# concurrent runs need a larger pool than requests' default of 10
+_rpc_session = requests.Session()
+_rpc_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32)
+_rpc_session.mount("http://", _rpc_adapter)
+_rpc_session.mount("https://", _rpc_adapter)
+w3 = Web3(Web3.HTTPProvider(RPC_URL, session=_rpc_session))
 
 # Check connection
 if not w3.is_connected():